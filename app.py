@@ -1,29 +1,64 @@
 import io
-import requests
-import qrcode
-from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+import json
+import click
+from datetime import datetime, timedelta
+from flask import Flask, render_template, make_response, request, redirect, url_for, flash, jsonify, send_file, Response, stream_with_context
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, User, Device, TimelineLog, SystemSetting, NotificationLog, Customer
+from sqlalchemy.orm import joinedload, selectinload
+from models import db, User, Device, TimelineLog, SystemSetting, NotificationLog, TrackingSequence, DeviceListing, log_fingerprint, DEVICE_STATUSES
+from changefeed import hub, record_change, stats_delta, iter_sse, BUSY_RETRY
+import assets
+import compression
+import listing
+import logging_setup
+import migrations
+import metrics
+import notifications
+from query_budget import query_budget, batched, init_app as init_query_budget
+import passwords
+from passwords import hash_password, verify_password, needs_rehash
+from user_cache import user_cache
+import json_provider
+from bulk_import import import_devices, iter_file_rows
+from intake import upsert_customers
+from export import iter_export, parse_period, INCLUDE_OPTIONS
+from tracking_ids import allocate_tracking_ids, is_valid_tracking_id, normalize_tracking_id, SEQUENCE_NAME
 
 import os
 import logging
 
-# Configure Logging
-logging.basicConfig(filename='app.log', level=logging.INFO, 
-                    format='%(asctime)s %(levelname)s: %(message)s')
-
-
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 db_path = os.path.join(BASE_DIR, 'repair_shop_v7.db')
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-prod')
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', f'sqlite:///{db_path}') # Benchmarks point this at a scratch DB
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['JSON_PROVIDER'] = os.environ.get('JSON_PROVIDER', 'auto') # auto | orjson | default
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+app.config['QUERY_BUDGET_MODE'] = os.environ.get('QUERY_BUDGET_MODE') # off | warn | raise (unset: by debug/testing)
+app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, 'instance', 'metrics')) # Shared by all workers
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN') # Optional bearer token for Prometheus scrapes
+app.config['USER_CACHE_DIR'] = os.environ.get('USER_CACHE_DIR', os.path.join(BASE_DIR, 'instance', 'user_epochs')) # Shared by all workers
+app.config['USER_CACHE_TTL'] = int(os.environ.get('USER_CACHE_TTL', 300))
+app.config.update(logging_setup.config_from_env()) # LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, LOG_ROTATE_WHEN, LOG_SOCKET
+app.config['STREAM_MAX'] = int(os.environ.get('STREAM_MAX_PER_WORKER', 100)) # Open SSE streams per process; gunicorn.conf.py lowers it for thread workers
+app.config['STATUS_NOTIFICATIONS'] = os.environ.get('STATUS_NOTIFICATIONS', '0') == '1' # Auto-send "Ready" messages on status updates (off by default)
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', passwords.DEFAULT_METHOD) # e.g. pbkdf2:sha256:600000
 
+logging_setup.init_app(app) # Queued logging: request threads never wait on the log file
 db.init_app(app)
+metrics.init_app(app) # First: its after_request runs last, so timings include compression
+init_query_budget(app)
+hub.init_app(app)
+notifications.init_app(app) # Infobip sends run on a background thread
+listing.init_app(app)
+user_cache.init_app(app)
+json_provider.init_app(app)
+compression.init_app(app)
+passwords.init_app(app)
+assets.init_app(app) # asset_url() for templates; static/dist/ is immutable and precompressed
+app.cli.add_command(migrations.db_cli) # flask db upgrade / flask db status
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -32,8 +67,8 @@ def init_db():
     """Ensure database tables exist on startup and create admin if missing."""
     with app.app_context():
         try:
-            # Create tables if they don't exist
-            db.create_all()
+            # Create missing tables, then apply pending schema migrations (migrations.py)
+            migrations.upgrade()
             
             # Check for Admin
             if not User.query.filter_by(username='admin').first():
@@ -41,7 +76,7 @@ def init_db():
                  # Generate hash for 'admin123'
                  admin = User(
                      username='admin', 
-                     password_hash=generate_password_hash('admin123'), 
+                     password_hash=hash_password('admin123'), 
                      role='admin',
                      is_first_login=True # Force password change
                  )
@@ -55,39 +90,133 @@ def init_db():
                 settings = SystemSetting()
                 db.session.add(settings)
                 db.session.commit()
+
+            # Initialize tracking ID sequence if missing
+            if not db.session.get(TrackingSequence, SEQUENCE_NAME):
+                db.session.add(TrackingSequence(name=SEQUENCE_NAME, next_value=1))
+                db.session.commit()
                 
         except Exception as e:
             logging.error(f"Database Initialization Error: {e}")
 
-# Initialize DB on import (or run manually)
-init_db()
+# Schema and seed rows are set up once per deploy, not on import (every gunicorn worker
+# imports this module): `flask --app app init-db`, gunicorn's on_starting hook, or `python app.py`.
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing tables/columns and seed the admin user, settings and ID sequence."""
+    init_db()
+    click.echo("Database initialized")
 
 # --- Helpers ---
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
-
-import random
-import string
+    return user_cache.get(user_id) # Cached snapshot, no query while the user's epoch is unchanged
 
 def generate_device_id():
-    """Generates a unique SER-ID (e.g., SER7A2B9)."""
-    prefix = "SER"
+    """Allocates a unique SER-ID (e.g., SER7A2B9QK) from the tracking sequence."""
+    return allocate_tracking_ids(1)[0]
+
+def device_card(d):
+    """Device as shown on a dashboard card (/api/devices rows and live events)."""
+    return {
+        'id': d.id,
+        'tracking_id': d.tracking_id,
+        'customer_name': d.customer.name,
+        'phone': d.customer.phone,
+        'model': d.model,
+        'description': d.description,
+        'status': d.status,
+        'created_at': d.created_at.strftime('%d/%m/%Y'),
+        'technician': d.technician.username if d.technician else '-',
+        'created_by': d.created_by.username if d.created_by else '-',
+        'brand': d.brand or '',
+        'is_archived': bool(d.is_archived),
+        'technician_id': d.technician_id,
+        'created_by_id': d.created_by_id
+    }
+
+def public_timeline_entry(log):
+    """Timeline entry as the customer sees it on the tracking page (no private notes)."""
+    return {
+        'status': log.status,
+        'note': log.public_note or log.note, # Show public note
+        'date': log.timestamp.strftime('%d/%m/%Y %H:%M'),
+        'staff': log.user.username if log.user else 'System'
+    }
+
+def apply_status_update(device, new_status, public_note, private_note, user_id):
+    """
+    Applies one status update to `device` in the current session (caller commits).
+    Returns None if it repeats the last log exactly (anti-spam), else whether the status changed.
+    Nothing is flushed here, so bulk updates write all devices in one flush at commit.
+    """
+    status_changed = (device.status != new_status)
+    before = (device.status, bool(device.is_archived))
     
-    while True:
-        # Generate 6 random characters (uppercase letters + digits)
-        chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        new_id = f"{prefix}{chars}"
+    # Smart Alert / Anti-Spam Logic
+    # If status is same AND notes are same (or empty), do duplicate check
+    if not status_changed:
+        # Compare against the fingerprint of the LAST log stored on the device (no log reads)
+        last_fingerprint = device.last_log_fingerprint
+        if last_fingerprint is None:
+            # Device last logged before the fingerprint existed: read only its latest log
+            last_log = TimelineLog.query.filter_by(device_id=device.id).order_by(TimelineLog.timestamp.desc()).first()
+            if last_log:
+                last_fingerprint = log_fingerprint(last_log.status, last_log.public_note, last_log.private_note)
+
+        if last_fingerprint == log_fingerprint(new_status, public_note, private_note):
+            return None
+
+    # Relationships (not ids) so the card and timeline entry below resolve without a flush
+    actor = db.session.get(User, user_id) if user_id else None
+
+    # If moving to "In Repair" (Στην επισκευή), assign current user as technician if not set?
+    if new_status == 'Υπό Επισκευή' and not device.technician_id:
+        device.technician = actor
+
+    if new_status == 'Αρχείο':
+        device.is_archived = True
+    else:
+        device.is_archived = False 
         
-        # Check uniqueness against DB
-        if not Device.query.filter_by(tracking_id=new_id).first():
-            return new_id
+    device.status = new_status 
+    
+    # Save log entry
+    log = TimelineLog(
+        device=device, 
+        status=new_status, 
+        public_note=public_note, 
+        private_note=private_note,
+        note=public_note, # Fallback
+        user=actor
+    )
+    db.session.add(log)
+    device.record_log(log)
+
+    # Live dashboards patch this card and their stats counters in place
+    record_change('status_changed', device.id,
+                  device=device_card(device),
+                  stats=stats_delta(before, (device.status, bool(device.is_archived))),
+                  public=public_timeline_entry(log))
+    return status_changed
+
+# Status -> InfobipService trigger. Only "Ready" is sent automatically (see Settings).
+NOTIFY_ON_STATUS = {'Έτοιμο': 'ready'}
+
+def notify_status_change(device_ids, new_status):
+    """Queues the status notification for all `device_ids` as one batch (call after commit)."""
+    trigger = NOTIFY_ON_STATUS.get(new_status)
+    if not app.config['STATUS_NOTIFICATIONS'] or not trigger or not device_ids:
+        return
+    notifications.dispatcher.enqueue(device_ids, trigger) # Sent by a background thread, not this request
 
 # --- Routes: Auth ---
 @app.before_request
 def check_first_login():
+    if request.endpoint == 'static':
+        return # Don't touch the session: it would add Vary: Cookie to cacheable files
     if current_user.is_authenticated and getattr(current_user, 'is_first_login', False):
-        if request.endpoint not in ['change_password', 'logout', 'static']:
+        if request.endpoint not in ['change_password', 'logout']:
             flash('Ειδοποίηση Ασφαλείας: Πρέπει να αλλάξετε τον κωδικό σας στην πρώτη σύνδεση.', 'warning')
             return redirect(url_for('change_password'))
 
@@ -98,8 +227,11 @@ def login():
         password = request.form.get('password')
         user = User.query.filter_by(username=username).first()
         
-        if user and check_password_hash(user.password_hash, password):
+        if user and verify_password(user.password_hash, password):
             user.last_login = datetime.utcnow()
+            if needs_rehash(user.password_hash):
+                # Hashing settings changed since this password was stored: upgrade it now
+                user.password_hash = hash_password(password)
             db.session.commit()
             login_user(user)
             
@@ -124,7 +256,8 @@ def change_password():
             flash('Όλα τα πεδία είναι υποχρεωτικά.', 'error')
             return render_template('change_password.html')
             
-        if not check_password_hash(current_user.password_hash, current_password):
+        user = db.session.get(User, current_user.id) # current_user is a cached snapshot
+        if not verify_password(user.password_hash, current_password):
             flash('Ο τρέχων κωδικός είναι λάθος.', 'error')
             return render_template('change_password.html')
 
@@ -137,9 +270,9 @@ def change_password():
             return render_template('change_password.html')
             
         # Update Password
-        current_user.password_hash = generate_password_hash(new_password)
-        current_user.is_first_login = False
-        db.session.commit()
+        user.password_hash = hash_password(new_password)
+        user.is_first_login = False
+        db.session.commit() # Bumps the user's cache epoch in every worker
         
         flash('Ο κωδικός ενημερώθηκε επιτυχώς.', 'success')
         return redirect(url_for('dashboard'))
@@ -154,9 +287,26 @@ def logout():
 
 
 # --- Routes: Public ---
+# Tracking page animation per status (Lottie JSON under static/, the status icons animated)
+STATUS_ANIMATIONS = {
+    'Παραλήφθηκε': 'lottie/status/received.json', # Box/Package
+    'Υπό Έλεγχο': 'lottie/status/checking.json', # Search/Check
+    'Υπό Επισκευή': 'lottie/status/repair.json', # Tools/Repair
+    'Έτοιμο': 'lottie/status/ready.json', # Checkmark/Success
+    'Αρχείο': 'lottie/status/archived.json', # Delivery/Handshake
+}
+
 @app.route('/')
+@query_budget(1)
 def index():
-    return render_template('index.html')
+    animations = {status: assets.asset_url(path) for status, path in STATUS_ANIMATIONS.items()}
+    # Opened from the label's QR code (/?id=...): preload the current status animation with the page
+    preload = None
+    tracking_id = normalize_tracking_id(request.args.get('id'))
+    if tracking_id and is_valid_tracking_id(tracking_id):
+        status = db.session.scalar(db.select(Device.status).filter_by(tracking_id=tracking_id))
+        preload = animations.get(status)
+    return render_template('index.html', animations=animations, preload_animation=preload)
 
 # --- SETTINGS ROUTES ---
 @app.route('/api/settings', methods=['GET', 'POST'])
@@ -226,12 +376,19 @@ def manage_settings():
 
 
 @app.route('/track')
+@query_budget(2)
 def track_device():
-    tracking_id = request.args.get('id')
+    tracking_id = normalize_tracking_id(request.args.get('id'))
     if not tracking_id:
         return jsonify({'error': 'Missing ID'}), 400
+
+    # Typos fail the check character here, before touching the DB
+    if not is_valid_tracking_id(tracking_id):
+        return jsonify({'error': 'Invalid ID'}), 400
         
-    device = Device.query.filter_by(tracking_id=tracking_id).first()
+    device = Device.query.options(
+        selectinload(Device.logs).joinedload(TimelineLog.user)
+    ).filter_by(tracking_id=tracking_id).first()
     if not device:
         return jsonify({'error': 'Not found'}), 404
         
@@ -271,13 +428,7 @@ def track_device():
     final_logs = sorted(unique_timeline, key=lambda x: x.timestamp, reverse=True)
     
     for log in final_logs:
-        staff_name = log.user.username if log.user else 'System'
-        timeline.append({
-            'status': log.status,
-            'note': log.public_note or log.note, # Show public note
-            'date': log.timestamp.strftime('%d/%m/%Y %H:%M'),
-            'staff': staff_name
-        })
+        timeline.append(public_timeline_entry(log))
 
     return jsonify({
         'device': {
@@ -289,10 +440,47 @@ def track_device():
         }
     })
 
+def _public_event(event):
+    # Customers only get the new public timeline entry, never the dashboard card
+    if event.kind != 'status_changed':
+        return None
+    payload = json.loads(event.payload)
+    return 'status_changed', json.dumps(payload['public'], ensure_ascii=False)
+
+def streams_busy():
+    # Every stream slot of this worker is taken: EventSource stops on a 503, the pages retry later
+    response = jsonify({'error': 'Too many live connections'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(BUSY_RETRY)
+    return response
+
+@app.route('/track/stream')
+def track_stream():
+    """SSE for one tracking ID: held open until the device's status changes (see changefeed.py)."""
+    tracking_id = normalize_tracking_id(request.args.get('id'))
+    if not tracking_id or not is_valid_tracking_id(tracking_id):
+        return jsonify({'error': 'Invalid ID'}), 400
+
+    device_id = db.session.execute(
+        db.select(Device.id).filter_by(tracking_id=tracking_id)
+    ).scalar_one_or_none()
+    if device_id is None:
+        return jsonify({'error': 'Not found'}), 404
+
+    if hub.is_full():
+        return streams_busy()
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        stream_with_context(iter_sse(last_event_id, device_id=device_id, transform=_public_event)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/devices/<int:device_id>/notifications')
 @login_required
+@query_budget(3)
 def get_device_notifications(device_id):
-    device = Device.query.get_or_404(device_id)
+    device = Device.query.options(selectinload(Device.notifications)).get_or_404(device_id)
     logs = [{
         'channel': n.channel,
         'status': n.status,
@@ -303,8 +491,11 @@ def get_device_notifications(device_id):
 
 @app.route('/api/devices/<int:device_id>/details')
 @login_required
+@query_budget(3)
 def get_device_details(device_id):
-    device = Device.query.get_or_404(device_id)
+    device = Device.query.options(
+        joinedload(Device.customer), selectinload(Device.logs).joinedload(TimelineLog.user)
+    ).get_or_404(device_id)
     
     logs = []
     for log in device.logs:
@@ -336,6 +527,7 @@ def get_device_details(device_id):
 
 @app.route('/api/devices/<int:device_id>/update_notes', methods=['POST'])
 @login_required
+@query_budget(5)
 def update_technician_notes(device_id):
     try:
         device = Device.query.get_or_404(device_id)
@@ -347,6 +539,7 @@ def update_technician_notes(device_id):
         # Here just saving text.
         
         device.technician_notes = notes
+        record_change('notes_updated', device.id, id=device.id, tracking_id=device.tracking_id)
         db.session.commit()
         return jsonify({'success': True})
     except Exception as e:
@@ -356,90 +549,170 @@ def update_technician_notes(device_id):
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    return render_template('dashboard.html', user=current_user)
+    # Scripts and styles are static files now, so the shell is small; browsers revalidate it by ETag
+    response = make_response(render_template('dashboard.html', user=current_user))
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.add_etag(weak=True) # Weak: compression changes the bytes, not the page
+    return response.make_conditional(request)
 
-@app.route('/api/devices')
-@login_required
-def get_devices():
-    status_filter = request.args.get('status')
-    user_id = request.args.get('user_id')
-    
-    query = Device.query
-    
+def filter_devices(query, status_filter, user_id, model=Device):
+    """Applies the dashboard list filters (?status=, ?user_id=) to a Device or DeviceListing query."""
     # User Filter (Ownership or Technician)
     if user_id:
         user = User.query.get(user_id)
         if user:
-            query = query.filter((Device.technician_id == user_id) | (Device.created_by_id == user_id))
+            query = query.filter((model.technician_id == user_id) | (model.created_by_id == user_id))
 
     # Status Filter - Greek Terms
     if status_filter == 'archive':
-        query = query.filter_by(is_archived=True)
+        query = query.filter(model.is_archived.is_(True))
     elif status_filter == 'ready':
-        query = query.filter_by(status='Έτοιμο', is_archived=False)
+        query = query.filter(model.status == 'Έτοιμο', model.is_archived.is_(False))
     elif status_filter == 'repair':
-        query = query.filter_by(status='Υπό Επισκευή', is_archived=False)
+        query = query.filter(model.status == 'Υπό Επισκευή', model.is_archived.is_(False))
     elif status_filter == 'checking':
-        query = query.filter_by(status='Υπό Έλεγχο', is_archived=False)
+        query = query.filter(model.status == 'Υπό Έλεγχο', model.is_archived.is_(False))
     elif status_filter == 'received':
-        query = query.filter_by(status='Παραλήφθηκε', is_archived=False)
+        query = query.filter(model.status == 'Παραλήφθηκε', model.is_archived.is_(False))
     elif status_filter == 'active': 
-        query = query.filter_by(is_archived=False)
-        
-    devices = query.order_by(Device.created_at.desc()).all()
+        query = query.filter(model.is_archived.is_(False))
+    return query
+
+# /api/devices field -> DeviceListing column (the list reads only the projection table)
+DEVICE_LIST_FIELDS = {
+    'id': DeviceListing.device_id,
+    'tracking_id': DeviceListing.tracking_id,
+    'customer_name': DeviceListing.customer_name,
+    'phone': DeviceListing.phone,
+    'model': DeviceListing.model,
+    'description': DeviceListing.description,
+    'status': DeviceListing.status,
+    'created_at': DeviceListing.created_at,
+    'technician': DeviceListing.technician,
+    'created_by': DeviceListing.created_by,
+    'brand': DeviceListing.brand,
+    'is_archived': DeviceListing.is_archived,
+    'technician_id': DeviceListing.technician_id,
+    'created_by_id': DeviceListing.created_by_id,
+}
+
+def _as_is(value):
+    return value
+
+# Same formatting as device_card()
+DEVICE_LIST_FORMAT = {
+    'created_at': lambda v: v.strftime('%d/%m/%Y'),
+    'technician': lambda v: v or '-',
+    'created_by': lambda v: v or '-',
+    'brand': lambda v: v or '',
+    'is_archived': bool,
+}
+
+def device_list_rows(fields, status_filter, user_id, changed_since=None):
+    """Formatted value lists for `fields`, newest first, from the listing table."""
+    stmt = db.select(*[DEVICE_LIST_FIELDS[f] for f in fields])
+    if changed_since is not None:
+        stmt = stmt.where(DeviceListing.listed_at > changed_since)
+    stmt = filter_devices(stmt, status_filter, user_id, model=DeviceListing).order_by(DeviceListing.created_at.desc())
+    return [[DEVICE_LIST_FORMAT.get(f, _as_is)(v) for f, v in zip(fields, row)] for row in db.session.execute(stmt)]
+
+# Cursors are server timestamps. Rows are stamped at flush but become visible at commit,
+# so each delta re-reads a short window before the cursor (clients merge by id).
+SYNC_CURSOR_OVERLAP = timedelta(seconds=5)
+
+def sync_cursor(now):
+    return now.isoformat()
+
+@app.route('/api/devices')
+@login_required
+@query_budget(3)
+def get_devices():
+    status_filter = request.args.get('status')
+    user_id = request.args.get('user_id')
     
-    return jsonify([{
-        'id': d.id,
-        'tracking_id': d.tracking_id,
-        'customer_name': d.customer.name,
-        'phone': d.customer.phone,
-        'model': d.model,
-        'description': d.description,
-        'status': d.status,
-        'created_at': d.created_at.strftime('%d/%m/%Y'),
-        'technician': d.technician.username if d.technician else '-',
-        'created_by': d.created_by.username if d.created_by else '-',
-        'brand': d.brand or ''
-    } for d in devices])
+    output = request.args.get('format', 'objects')
+    
+    # Sparse fieldsets: ?fields=id,status,tracking_id limits both the SELECT and the JSON keys
+    fields = [f for f in request.args.get('fields', '').split(',') if f] or list(DEVICE_LIST_FIELDS)
+    unknown = [f for f in fields if f not in DEVICE_LIST_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    cursor = sync_cursor(datetime.utcnow())
+    values = device_list_rows(fields, status_filter, user_id)
+    
+    if output == 'columnar':
+        # Keys once, then one array of values per device
+        response = jsonify({'columns': fields, 'rows': values})
+    else:
+        response = jsonify([dict(zip(fields, v)) for v in values])
+    response.headers['X-Sync-Cursor'] = cursor # Pass as ?since= to /api/devices/changes
+    return response
+
+@app.route('/api/devices/changes')
+@login_required
+@query_budget(4)
+def get_device_changes():
+    """
+    Delta sync for the dashboard list: devices created/modified since ?since=<cursor>
+    that match the same filters as /api/devices, plus tombstones (ids that changed
+    but no longer belong in the list, e.g. archived).
+    """
+    status_filter = request.args.get('status')
+    user_id = request.args.get('user_id')
+    try:
+        since = datetime.fromisoformat(request.args.get('since', ''))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    cursor = sync_cursor(datetime.utcnow())
+    window = since - SYNC_CURSOR_OVERLAP
+    # Listing rows are rewritten whenever anything on the card changes (device, customer, staff)
+    changed_ids = set(db.session.scalars(db.select(DeviceListing.device_id).where(DeviceListing.listed_at > window)))
+    fields = list(DEVICE_LIST_FIELDS)
+    cards = [dict(zip(fields, v)) for v in device_list_rows(fields, status_filter, user_id, window)] if changed_ids else []
+
+    return jsonify({
+        'cursor': cursor,
+        'changed': cards,
+        'removed': sorted(changed_ids - {card['id'] for card in cards})
+    })
+
+@app.route('/api/events/stream')
+@login_required
+def device_events():
+    """Server-Sent Events: live device changes for the dashboard (see changefeed.py)."""
+    if hub.is_full():
+        return streams_busy()
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        stream_with_context(iter_sse(last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/stats')
 @login_required
+@query_budget(2)
 def get_stats():
     user_id = request.args.get('user_id')
-    base_query = Device.query
+    query = db.select(Device.status, Device.is_archived, db.func.count()).group_by(Device.status, Device.is_archived)
     
     if user_id:
-        base_query = base_query.filter((Device.technician_id == user_id) | (Device.created_by_id == user_id))
+        query = query.where((Device.technician_id == user_id) | (Device.created_by_id == user_id))
     
-    def count_with_filter(status_list, archived=False):
-        q = base_query
-        if archived:
-            q = q.filter(Device.is_archived==True)
-        else:
-            q = q.filter(Device.is_archived==False)
-            if status_list:
-                q = q.filter(Device.status.in_(status_list))
-        return q.count()
-
-    # 6-Card System (Greek)
-    total = count_with_filter(None, archived=False) # Σύνολο
-    received = count_with_filter(['Παραλήφθηκε'], archived=False) # Yellow
-    checking = count_with_filter(['Υπό Έλεγχο'], archived=False) # Blue
-    repair = count_with_filter(['Υπό Επισκευή'], archived=False) # Orange
-    ready = count_with_filter(['Έτοιμο'], archived=False) # Green
-    completed = count_with_filter(None, archived=True) # Αρχείο
+    # One grouped count, folded into the 6-Card System (Greek)
+    counts = {'total': 0, 'received': 0, 'checking': 0, 'repair': 0, 'ready': 0, 'completed': 0}
+    for status, archived, count in db.session.execute(query):
+        for key, value in stats_delta(None, (status, bool(archived))).items():
+            counts[key] += value * count
     
-    return jsonify({
-        'total': total,
-        'received': received,
-        'checking': checking,
-        'repair': repair,
-        'ready': ready,
-        'completed': completed
-    })
+    return jsonify(counts)
 
 @app.route('/add_device', methods=['POST'])
 @login_required
+@query_budget(13)
 def add_device():
     try:
         data = request.form
@@ -451,26 +724,17 @@ def add_device():
         if not customer_name or not phone:
              return jsonify({'success': False, 'error': 'Name and Phone required'}), 400
 
-        # customer_name might be existing customer? Logic: Check by phone
-        customer = Customer.query.filter_by(phone=phone).first()
-        if not customer:
-            customer = Customer(name=customer_name, phone=phone)
-            db.session.add(customer)
-            db.session.commit() # Commit to get ID
-        else:
-            # Optional: Update name if changed?
-            if customer.name != customer_name:
-                customer.name = customer_name
-            if email: # Update email if provided
-                 customer.email = email
-            db.session.commit()
+        # Customer is matched by phone: INSERT ... ON CONFLICT updates name/email in place,
+        # so concurrent intakes for the same phone can't create duplicates.
+        # Nothing is committed until the device and its first log are in (single transaction).
+        customer_id = upsert_customers([{'name': customer_name, 'phone': phone, 'email': email}])[phone]
 
         new_id = generate_device_id()
         
         # Default status: Παραλήφθηκε
         device = Device(
             tracking_id=new_id,
-            customer_id=customer.id,
+            customer_id=customer_id,
             brand=brand, # Added brand
             model=data.get('model'),
             description=data.get('description'),
@@ -489,6 +753,11 @@ def add_device():
             user_id=current_user.id
         )
         db.session.add(log)
+        device.record_log(log)
+        db.session.flush()
+        record_change('device_created', device.id,
+                      device=device_card(device),
+                      stats=stats_delta(None, (device.status, False)))
         db.session.commit()
 
         # Return token/id and also Who created it (for label)
@@ -499,10 +768,12 @@ def add_device():
         })
     except Exception as e:
         logging.error(f"Error adding device: {e}")
+        db.session.rollback()
         return jsonify({'success': False, 'error': 'Server Error'}), 500
 
 @app.route('/update_status/<int:device_id>', methods=['POST'])
 @login_required
+@query_budget(12)
 def update_status(device_id):
     device = Device.query.get_or_404(device_id)
     try:
@@ -515,61 +786,18 @@ def update_status(device_id):
         if public_note == 'None': public_note = ''
         if private_note == 'None': private_note = ''
         
-        old_status = device.status
-        status_changed = (old_status != new_status)
-        
-        # Smart Alert / Anti-Spam Logic
-        # If status is same AND notes are same (or empty), do duplicate check
-        if not status_changed:
-            # Check the LAST log
-            if device.logs:
-                # Get the latest log (assuming insertion order or sort)
-                # We can Query explicitly to be safe
-                last_log = TimelineLog.query.filter_by(device_id=device.id).order_by(TimelineLog.timestamp.desc()).first()
-                if last_log:
-                    # Check if contents match
-                    last_public = last_log.public_note or ''
-                    last_private = last_log.private_note or ''
-                    
-                    if last_public == public_note and last_private == private_note:
-                        # Exact duplicate of the last action. Ignore.
-                        logging.info(f"Duplicate status update ignored for Device {device.tracking_id}")
-                        return jsonify({'success': True, 'message': 'Duplicate update ignored'})
-
-        # If moving to "In Repair" (Στην επισκευή), assign current user as technician if not set?
-        if new_status == 'Υπό Επισκευή' and not device.technician_id:
-            device.technician_id = current_user.id
-
-        if new_status == 'Αρχείο':
-            device.is_archived = True
-        else:
-            device.is_archived = False 
-            
-        device.status = new_status 
-        
-        # Save log entry
-        log = TimelineLog(
-            device=device, 
-            status=new_status, 
-            public_note=public_note, 
-            private_note=private_note,
-            note=public_note, # Fallback
-            user_id=current_user.id
-        )
-        db.session.add(log)
+        status_changed = apply_status_update(device, new_status, public_note, private_note, current_user.id)
+        if status_changed is None:
+            # Exact duplicate of the last action. Ignore.
+            logging.info(f"Duplicate status update ignored for Device {device.tracking_id}")
+            return jsonify({'success': True, 'message': 'Duplicate update ignored'})
         db.session.commit()
         
         # Smart Notification Logic: Only send if status CHANGED
         # Also, safeguard against sending notification if it's just a note update?
         # User requirement: "Smart Notification"
         if status_changed:
-            try:
-                # Placeholder for Infobip integration
-                # from infobip_service import InfobipService
-                # InfobipService.send_status_update(device, new_status)
-                pass
-            except Exception as e:
-                logging.error(f"Notification System Error: {e}")
+            notify_status_change([device_id], new_status)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -577,12 +805,63 @@ def update_status(device_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': 'Database Error'}), 500
 
+BULK_STATUS_MAX = 200 # Devices per bulk update
+
+@app.route('/api/devices/bulk_status', methods=['POST'])
+@login_required
+@query_budget(8 + 2 * BULK_STATUS_MAX) # Fixed reads/writes + each device's timeline log and feed event (SQLite inserts them one by one)
+def bulk_update_status():
+    data = request.json or {}
+    new_status = data.get('status')
+    public_note = (data.get('public_note') or '').strip()
+    private_note = (data.get('private_note') or '').strip()
+    try:
+        device_ids = {int(i) for i in data.get('device_ids', [])}
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid device ids'}), 400
+
+    if new_status not in DEVICE_STATUSES:
+        return jsonify({'success': False, 'error': 'Invalid status'}), 400
+    if not device_ids:
+        return jsonify({'success': False, 'error': 'No devices selected'}), 400
+    if len(device_ids) > BULK_STATUS_MAX:
+        return jsonify({'success': False, 'error': f'Too many devices (max {BULK_STATUS_MAX})'}), 400
+
+    # One query for all devices, with what their live-update cards show
+    devices = Device.query.options(
+        joinedload(Device.customer), joinedload(Device.technician), joinedload(Device.created_by)
+    ).filter(Device.id.in_(device_ids)).all()
+    found_ids = [d.id for d in devices] # Read before the commit expires the objects
+    changed, ignored = [], []
+    try:
+        for device in devices:
+            status_changed = apply_status_update(device, new_status, public_note, private_note, current_user.id)
+            if status_changed is None:
+                ignored.append(device.id)
+            elif status_changed:
+                changed.append(device.id)
+        db.session.commit()
+    except Exception as e:
+        logging.error(f"Error in bulk status update: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': 'Database Error'}), 500
+
+    notify_status_change(changed, new_status)
+
+    return jsonify({
+        'success': True,
+        'updated': len(found_ids) - len(ignored),
+        'ignored': sorted(ignored),
+        'missing': sorted(device_ids - set(found_ids))
+    })
+
 @app.route('/generate_qr/<device_id>')
 def generate_qr_code(device_id):
     device = Device.query.filter_by(tracking_id=device_id).first_or_404()
     # URL to the public tracking page
     url = url_for('index', _external=True) + f"?id={device.tracking_id}"
     
+    import qrcode # Pulls in PIL: loaded on first use, not at worker boot
     img = qrcode.make(url)
     buf = io.BytesIO()
     img.save(buf)
@@ -613,7 +892,7 @@ def manage_staff():
     if User.query.filter_by(username=username).first():
         return jsonify({'success': False, 'message': 'User exists'}), 400
         
-    hashed = generate_password_hash(password)
+    hashed = hash_password(password)
     new_staff = User(username=username, password_hash=hashed, role=role)
     db.session.add(new_staff)
     db.session.commit()
@@ -637,5 +916,124 @@ def delete_staff(user_id):
         logging.error(f"Error deleting staff: {e}")
         return jsonify({'success': False, 'message': 'Database error'}), 500
 
+# --- Metrics ---
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text format, summed over all workers (see metrics.py). Admins or METRICS_TOKEN."""
+    token = app.config.get('METRICS_TOKEN')
+    if not (token and request.headers.get('Authorization') == f'Bearer {token}'):
+        if not current_user.is_authenticated or current_user.role != 'admin':
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# --- Bulk Import ---
+@app.route('/api/import', methods=['POST'])
+@login_required
+@batched # Tracking ids and customers are read once per batch of rows
+def import_devices_upload():
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'success': False, 'message': 'No file'}), 400
+    if not upload.filename.lower().endswith(('.csv', '.xlsx')):
+        return jsonify({'success': False, 'message': 'Only CSV or XLSX files'}), 400
+
+    # Werkzeug spools large uploads to disk; rows are read from the stream batch by batch
+    try:
+        report = import_devices(iter_file_rows(upload.stream, upload.filename), user_id=current_user.id)
+    except Exception as e:
+        logging.error(f"Bulk import error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': True, **report})
+
+# --- Export ---
+@app.route('/api/export')
+@login_required
+def export_devices():
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'success': False, 'message': 'Format must be csv or ndjson'}), 400
+    include = [opt for opt in request.args.get('include', '').split(',') if opt in INCLUDE_OPTIONS]
+    try:
+        start, end = parse_period(request.args.get('month'), request.args.get('from'), request.args.get('to'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid date'}), 400
+
+    # Generator response: rows are fetched in chunks and sent as they are produced
+    filename = f"devices_{request.args.get('month') or datetime.utcnow().strftime('%Y%m%d')}.{fmt}"
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'text/csv'
+    return Response(
+        stream_with_context(iter_export(fmt, start, end, include)),
+        mimetype=f'{mimetype}; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+# --- CLI ---
+@app.cli.command('import-devices')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction.')
+@click.option('--user', 'username', default=None, help='Username recorded as creator of the imported devices.')
+def import_devices_command(path, batch_size, username):
+    """Import legacy devices/customers from a CSV or XLSX file."""
+    user_id = None
+    if username:
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            raise click.ClickException(f"Unknown user: {username}")
+        user_id = user.id
+
+    with open(path, 'rb') as f:
+        report = import_devices(iter_file_rows(f, path), user_id=user_id, batch_size=batch_size)
+
+    for error in report['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"{report['imported']}/{report['rows']} rows imported, {report['failed']} failed "
+               f"in {report['elapsed']}s ({report['rows_per_sec']} rows/sec)")
+
+@app.cli.command('export-devices')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default='csv', show_default=True)
+@click.option('--month', default=None, help='Only devices created in this month (YYYY-MM).')
+@click.option('--include', default='', help='Comma-separated: timeline,notifications.')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-', help='Output file (default: stdout).')
+def export_devices_command(fmt, month, include, output):
+    """Stream devices (with customers, optionally timelines/notifications) as CSV or NDJSON."""
+    try:
+        start, end = parse_period(month)
+    except ValueError:
+        raise click.BadParameter('expected YYYY-MM', param_hint='--month')
+    include = [opt for opt in include.split(',') if opt in INCLUDE_OPTIONS]
+    for chunk in iter_export(fmt, start, end, include):
+        output.write(chunk)
+
+@app.cli.command('generate-data')
+@click.option('--devices', default=10000, show_default=True, help='Devices to create (each with its timeline).')
+@click.option('--customers', default=None, type=int, help='Customers to create (default: 70% of devices).')
+@click.option('--staff', default=8, show_default=True, help='Technician accounts (tech1..N) to spread work over.')
+@click.option('--days', default=365, show_default=True, help='Devices are created over this many past days.')
+@click.option('--seed', default=1, show_default=True, help='Random seed (same seed and --now, same data).')
+@click.option('--now', type=click.DateTime(['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S']), default=None,
+              help='Date the history runs up to (default: the current time).')
+@click.option('--batch-size', default=5000, show_default=True, help='Devices per transaction.')
+def generate_data_command(devices, customers, staff, days, seed, now, batch_size):
+    """Fill the database with realistic synthetic customers, devices, timelines and notifications."""
+    from datagen import ShopDataGenerator
+    generator = ShopDataGenerator(seed=seed, days=days, staff=staff, now=now)
+    counts = generator.generate(devices, customers, batch_size,
+                                progress=lambda c: click.echo(f"  {c['devices']}/{devices} devices", err=True))
+    click.echo(f"Created {counts['customers']} customers, {counts['devices']} devices, {counts['logs']} logs, "
+               f"{counts['notifications']} notifications in {counts['elapsed']}s")
+
+@app.cli.command('rebuild-listings')
+def rebuild_listings_command():
+    """Recreate the dashboard list projection from the device/customer/user tables."""
+    listing.rebuild_listings()
+    click.echo(f"Rebuilt {DeviceListing.query.count()} listing rows")
+
 if __name__ == '__main__':
+    init_db()
     app.run(debug=True, use_reloader=False) # use_reloader=False to prevent double init in some envs
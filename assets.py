@@ -0,0 +1,252 @@
+import os
+import re
+import json
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import click
+from urllib.parse import urljoin
+from flask import current_app, request, url_for, send_file, abort
+from flask.cli import AppGroup
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+# Third-party files served from static/vendor/ (committed; `flask assets vendor` re-fetches them
+# after a version bump). Versions are pinned: the CDN URL doubles as the fallback while a file is missing.
+VENDOR = {
+    'vendor/bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/js/bootstrap.bundle.min.js',
+    'vendor/fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.6.0/css/all.min.css',
+    'vendor/lottie/lottie.min.js': 'https://cdn.jsdelivr.net/npm/lottie-web@5.7.5/build/player/lottie.min.js',
+}
+
+DIST = 'dist'  # Fingerprinted copies (under static/), not committed
+MINIFY = ('js/', 'css/')  # Our own sources (vendor files ship minified)
+COMPRESSIBLE = {'.css', '.js', '.json', '.svg', '.ttf', '.eot', '.map', '.txt'}
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+_CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+
+
+def _is_relative(url):
+    return not url.startswith(('data:', 'http:', 'https:', '//', '/', '#'))
+
+
+def _split_suffix(url):
+    """'a.woff2?v=1#x' -> ('a.woff2', '?v=1#x')"""
+    cut = min([i for i in (url.find('?'), url.find('#')) if i >= 0] or [len(url)])
+    return url[:cut], url[cut:]
+
+
+# --- Vendoring ---
+def vendor(static_folder, session=None):
+    """Downloads VENDOR into static/, plus the fonts/images their stylesheets reference. Returns the paths written."""
+    import requests
+    session = session or requests.Session()
+    written = []
+
+    def fetch(path, url):
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        target = os.path.join(static_folder, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        written.append(path)
+        if path.endswith('.css'):
+            for ref in {m.group(2) for m in _CSS_URL.finditer(response.text)}:
+                ref, _ = _split_suffix(ref)
+                if _is_relative(ref):
+                    fetch(posixpath.normpath(posixpath.join(posixpath.dirname(path), ref)),
+                          urljoin(url, ref))
+
+    for path, url in VENDOR.items():
+        fetch(path, url)
+    return written
+
+
+# --- Build ---
+def _fingerprinted(path, content):
+    root, ext = posixpath.splitext(path)
+    return f"{DIST}/{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def _rewrite_css(path, content, manifest):
+    """Points relative url()s at the fingerprinted copies, relative to where this file will live."""
+    built_dir = posixpath.dirname(_fingerprinted(path, b''))
+
+    def replace(match):
+        ref, suffix = _split_suffix(match.group(2))
+        if not _is_relative(ref):
+            return match.group(0)
+        target = manifest.get(posixpath.normpath(posixpath.join(posixpath.dirname(path), ref)))
+        if not target:
+            return match.group(0)
+        return f'url({posixpath.relpath(target, built_dir)}{suffix})'
+    return _CSS_URL.sub(replace, content.decode('utf-8')).encode('utf-8')
+
+
+def _strip_js(text):
+    """
+    Fallback when rjsmin isn't installed: drops indentation, blank lines and whole-line //
+    comments. Line breaks stay, so automatic semicolon insertion behaves as before; inside
+    template literals only indentation goes (they hold HTML, where it doesn't matter).
+    """
+    out, in_template = [], False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not in_template and (not stripped or stripped.startswith('//')):
+            continue
+        out.append(stripped)
+        if (line.count('`') - line.count('\\`')) % 2:
+            in_template = not in_template
+    return '\n'.join(out) + '\n'
+
+
+def _minify(path, content):
+    if not path.startswith(MINIFY) or '.min.' in path:
+        return content
+    text = content.decode('utf-8')
+    if path.endswith('.js'):
+        text = rjsmin.jsmin(text) if rjsmin else _strip_js(text)
+    elif path.endswith('.css'):
+        text = '\n'.join(line.strip() for line in _CSS_COMMENT.sub('', text).splitlines() if line.strip()) + '\n'
+    return text.encode('utf-8')
+
+
+def _write(static_folder, path, content):
+    target = os.path.join(static_folder, *path.split('/'))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(content)
+    if posixpath.splitext(path)[1] not in COMPRESSIBLE:
+        return
+    # Precompressed once at maximum level, so requests only pick a file
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['.br'] = brotli.compress(content, quality=11)
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            with open(target + suffix, 'wb') as f:
+                f.write(data)
+
+
+def build(static_folder):
+    """
+    Copies every file under static/ (except dist/) to dist/ with a content hash in its name,
+    writes .gz/.br variants and dist/manifest.json (source path -> built path). Stylesheets are
+    done last, with their url()s rewritten to the built names; our own js/ and css/ are minified.
+    Returns the manifest.
+    """
+    sources = []
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder).replace(os.sep, '/')
+        if rel_root == DIST or rel_root.startswith(DIST + '/'):
+            dirs[:] = []
+            continue
+        for name in files:
+            if not name.endswith(('.gz', '.br')):
+                sources.append(posixpath.normpath(posixpath.join(rel_root, name)))
+    sources.sort(key=lambda p: (p.endswith('.css'), p))
+
+    manifest = {}
+    for path in sources:
+        with open(os.path.join(static_folder, *path.split('/')), 'rb') as f:
+            content = f.read()
+        if path.endswith('.css'):
+            content = _rewrite_css(path, content, manifest)
+        content = _minify(path, content)
+        manifest[path] = _fingerprinted(path, content)
+        _write(static_folder, manifest[path], content)
+
+    # Old fingerprinted files stay: pages rendered before a deploy may still reference them
+    target = os.path.join(static_folder, DIST, 'manifest.json')
+    with open(target + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(target + '.tmp', target)
+    return manifest
+
+
+# --- Serving ---
+def _manifest():
+    """dist/manifest.json, reloaded when a build replaces it."""
+    state = current_app.extensions['assets']
+    try:
+        mtime = os.stat(state['path']).st_mtime_ns
+    except OSError:
+        return {}
+    if state['mtime'] != mtime:
+        with open(state['path']) as f:
+            state['manifest'] = json.load(f)
+        state['mtime'] = mtime
+    return state['manifest']
+
+
+def asset_url(path):
+    """Template helper: the fingerprinted URL when built, else the plain static file (or the CDN for missing vendor files)."""
+    built = _manifest().get(path)
+    if built:
+        return url_for('static', filename=built)
+    if path in VENDOR and not os.path.isfile(os.path.join(current_app.static_folder, *path.split('/'))):
+        return VENDOR[path]
+    return url_for('static', filename=path)
+
+
+def serve_static(filename):
+    """Static view: fingerprinted files are immutable and served precompressed when the client accepts it."""
+    if not filename.startswith(DIST + '/'):
+        return current_app.send_static_file(filename)
+
+    path = safe_join(current_app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    available = [(encoding, suffix) for encoding, suffix in ENCODINGS if os.path.isfile(path + suffix)]
+    encoding = request.accept_encodings.best_match([e for e, _ in available])
+    suffix = dict(available).get(encoding, '')
+
+    response = send_file(path + suffix, mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                         conditional=True, max_age=IMMUTABLE_MAX_AGE)
+    if suffix:
+        response.headers['Content-Encoding'] = encoding
+    if available:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+# --- CLI: flask assets vendor / flask assets build ---
+assets_cli = AppGroup('assets', help='Static assets.')
+
+
+@assets_cli.command('vendor')
+def vendor_command():
+    """Download the pinned third-party files into static/vendor/."""
+    for path in vendor(current_app.static_folder):
+        click.echo(path)
+
+
+@assets_cli.command('build')
+def build_command():
+    """Fingerprint and precompress static files into static/dist/."""
+    manifest = build(current_app.static_folder)
+    click.echo(f"Built {len(manifest)} files")
+
+
+def init_app(app):
+    """Registers asset_url() for templates, the static view and the `flask assets` commands."""
+    app.extensions['assets'] = {'path': os.path.join(app.static_folder, DIST, 'manifest.json'), 'mtime': None, 'manifest': {}}
+    app.view_functions['static'] = serve_static
+    app.add_template_global(asset_url)
+    app.cli.add_command(assets_cli)
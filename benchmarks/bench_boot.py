@@ -0,0 +1,62 @@
+"""
+Worker boot time: how long importing the app takes in a fresh interpreter.
+
+    python benchmarks/bench_boot.py [--runs 10] [--top 15]
+
+Each run starts `python -c "import app"` (what every gunicorn worker does) against a
+scratch database and times it. Prints min/median/max, then the slowest imports by
+cumulative time from one `python -X importtime` run.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def boot_once(env):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import app'], cwd=ROOT, env=env, check=True)
+    return time.perf_counter() - started
+
+
+def slowest_imports(env, top):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'boot.db')}",
+                   METRICS_DIR=os.path.join(tmp, 'metrics'),
+                   LOG_FILE=os.path.join(tmp, 'app.log'))
+        boot_once(env)  # Warm the OS file cache and bytecode
+        times = [boot_once(env) for _ in range(args.runs)]
+        print(f"import app: min {min(times) * 1000:.0f} ms  median {statistics.median(times) * 1000:.0f} ms  "
+              f"max {max(times) * 1000:.0f} ms  ({args.runs} runs)")
+
+        print("\nSlowest imports (cumulative):")
+        for micros, name in slowest_imports(env, args.top):
+            print(f"{micros / 1000:8.1f} ms {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+End-to-end request benchmarks against a seeded database.
+
+    python benchmarks/bench_http.py [--devices 100000] [--requests 200] [--db /tmp/bench.db] [--output results.json]
+                                    [--baseline baseline.json] [--max-regression 20]
+
+Seeds a scratch SQLite database with datagen.ShopDataGenerator at a fixed seed and date
+(reused on later runs when --db points at an already seeded file of the same scale), then drives the main routes
+through the Flask app in-process (no network): /track, /api/devices with each filter,
+/api/stats, device details, add_device and update_status. For each scenario prints
+throughput and p50/p95/p99 latency and writes them to --output as JSON.
+
+With --baseline, each scenario is compared against a stored result file and the
+run exits with status 1 when p95 or throughput regress by more than --max-regression %.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STATUS_FLOW = ['Παραλήφθηκε', 'Υπό Έλεγχο', 'Υπό Επισκευή', 'Έτοιμο', 'Αρχείο']
+FILTERS = [None, 'active', 'received', 'checking', 'repair', 'ready', 'archive']
+CHUNK = 10000
+BENCH_NOW = datetime(2025, 1, 1)  # Fixed "now" for the generator, so every seeded database is identical
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def seed(app, devices, staff=10, seed_value=1):
+    """Fills the scratch database with ShopDataGenerator (the same data as `generate-data --seed 1 --now 2025-01-01`)."""
+    from sqlalchemy import update
+    from models import db, User
+    from datagen import ShopDataGenerator
+
+    with app.app_context():
+        counts = ShopDataGenerator(seed=seed_value, staff=staff, now=BENCH_NOW).generate(devices, batch_size=CHUNK)
+        db.session.execute(update(User).where(User.username == 'admin').values(is_first_login=False))
+        db.session.commit()
+    return counts
+
+
+def run_scenario(client, name, make_request, count, warmup=3):
+    for i in range(warmup):
+        make_request(-1 - i)
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        response = make_request(i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    result = {
+        'requests': count,
+        'throughput_rps': round(count / elapsed, 1),
+        'mean_ms': round(sum(latencies) / count, 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+    }
+    print(f"{name:<28} {result['throughput_rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}  "
+          f"p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms  {result['statuses']}")
+    return result
+
+
+def run_all(app, devices, count, seed_value=2):
+    from tracking_ids import format_tracking_id
+
+    rng = random.Random(seed_value)
+    run_id = int(time.time())  # Unique notes: a reused DB would otherwise see duplicate updates (ignored early)
+    client = app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    if response.status_code != 302:
+        raise SystemExit("Benchmark login failed (admin/admin123)")
+
+    scenarios = {
+        'track': lambda i: client.get(f"/track?id={format_tracking_id(rng.randrange(1, devices + 1))}"),
+        'stats': lambda i: client.get('/api/stats'),
+        'device_details': lambda i: client.get(f"/api/devices/{rng.randrange(1, devices + 1)}/details"),
+    }
+    for status in FILTERS:
+        scenarios[f"devices[{status or 'all'}]"] = (lambda s: lambda i: client.get('/api/devices', query_string={'status': s} if s else {}))(status)
+    scenarios['devices[user_id]'] = lambda i: client.get('/api/devices', query_string={'status': 'active', 'user_id': 2})
+    scenarios['add_device'] = lambda i: client.post('/add_device', data={
+        'customer_name': 'Νέος Πελάτης', 'phone': f"68{rng.randrange(10 ** 8):08d}", 'model': 'iPhone 13', 'brand': 'Apple'})
+    scenarios['update_status'] = lambda i: client.post(f"/update_status/{rng.randrange(1, devices + 1)}", data={
+        'status': rng.choice(STATUS_FLOW[:4]), 'public_note': f"Σημείωση {run_id}-{i}"})
+
+    results = {}
+    for name, make_request in scenarios.items():
+        # List endpoints return the whole filtered list: fewer iterations keep runs bounded
+        n = max(10, count // 10) if name.startswith('devices[') else count
+        results[name] = run_scenario(client, name, make_request, n)
+    return results
+
+
+def compare(results, baseline, max_regression):
+    """Prints the change per scenario; returns the scenarios that regressed beyond max_regression %."""
+    regressed = []
+    print(f"\n{'scenario':<28} {'rps':>10} {'p95':>10}")
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        rps_change = (result['throughput_rps'] - base['throughput_rps']) / base['throughput_rps'] * 100
+        p95_change = (result['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100 if base['p95_ms'] else 0.0
+        flag = ''
+        if rps_change < -max_regression or p95_change > max_regression:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<28} {rps_change:+9.1f}% {p95_change:+9.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--devices', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario (list scenarios run 1/10 of this)')
+    parser.add_argument('--db', default=None, help='SQLite file to seed/reuse (default: temporary)')
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    parser.add_argument('--baseline', default=None, help='Results JSON to compare against')
+    parser.add_argument('--max-regression', type=float, default=20.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_http_')
+    try:
+        db_file = os.path.abspath(args.db or os.path.join(tmp, 'bench.db'))
+        scale = {'devices': args.devices, 'now': BENCH_NOW.isoformat()}
+        marker = db_file + '.scale.json'
+        reuse = os.path.exists(db_file) and os.path.exists(marker) and json.load(open(marker)) == scale
+        if os.path.exists(db_file) and not reuse:
+            os.remove(db_file)
+
+        # Configure the app before importing it: scratch DB, no query budget checks, metrics, user epochs and log off the repo
+        os.environ['DATABASE_URL'] = f"sqlite:///{db_file}"
+        os.environ['QUERY_BUDGET_MODE'] = 'off'
+        os.environ.setdefault('METRICS_DIR', os.path.join(tmp, 'metrics'))
+        os.environ.setdefault('USER_CACHE_DIR', os.path.join(tmp, 'user_epochs'))
+        os.environ.setdefault('LOG_FILE', os.path.join(tmp, 'app.log'))
+        from app import app, init_db
+        init_db()
+
+        if not reuse:
+            started = time.perf_counter()
+            counts = seed(app, args.devices)
+            json.dump(scale, open(marker, 'w'))
+            print(f"Seeded {counts['devices']} devices, {counts['logs']} logs, {counts['notifications']} notifications "
+                  f"in {time.perf_counter() - started:.1f}s -> {db_file}")
+
+        results = run_all(app, args.devices, args.requests)
+        report = {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+                'scale': scale,
+                'requests': args.requests,
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'machine': platform.machine(),
+            },
+            'results': results,
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"Results written to {args.output}")
+
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressed = compare(results, json.load(f), args.max_regression)
+            if regressed:
+                print(f"Regressed beyond {args.max_regression}%: {', '.join(regressed)}")
+                sys.exit(1)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
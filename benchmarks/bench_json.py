@@ -0,0 +1,93 @@
+"""
+JSON encoding + compression tradeoff for /api/devices-style payloads.
+
+    python benchmarks/bench_json.py [--sizes 100,1000,10000]
+
+For each list size prints encode time per encoder and, for the compact UTF-8 body,
+compressed size and compression time per codec.
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATUSES = ['Παραλήφθηκε', 'Υπό Έλεγχο', 'Υπό Επισκευή', 'Έτοιμο', 'Αρχείο']
+NAMES = ['Γιώργος Παπαδόπουλος', 'Μαρία Κωνσταντίνου', 'Νίκος Γεωργίου', 'Ελένη Δημητρίου', 'Κώστας Ιωάννου']
+DESCRIPTIONS = ['Σπασμένη οθόνη', 'Δεν φορτίζει', 'Πρόβλημα μπαταρίας, κλείνει μόνο του', 'Δεν ανάβει', 'Αλλαγή θύρας φόρτισης']
+
+
+def make_devices(n, rng):
+    return [{
+        'id': i,
+        'tracking_id': f"SER{rng.randrange(36 ** 7):07X}"[:10],
+        'customer_name': rng.choice(NAMES),
+        'phone': f"+3069{rng.randrange(10 ** 8):08d}",
+        'model': f"Galaxy S{rng.randrange(8, 25)}",
+        'description': rng.choice(DESCRIPTIONS),
+        'status': rng.choice(STATUSES),
+        'created_at': '19/10/2026',
+        'technician': 'tech1',
+        'created_by': 'admin',
+        'brand': 'Samsung',
+    } for i in range(n)]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    encoders = {
+        'stdlib (flask default, ascii)': lambda obj: json.dumps(obj).encode(),
+        'stdlib (utf-8, compact)': lambda obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode(),
+    }
+    if orjson:
+        encoders['orjson'] = orjson.dumps
+
+    codecs = {
+        'gzip-1': lambda b: gzip.compress(b, compresslevel=1, mtime=0),
+        'gzip-6': lambda b: gzip.compress(b, compresslevel=6, mtime=0),
+    }
+    if brotli:
+        codecs['br-4'] = lambda b: brotli.compress(b, quality=4)
+        codecs['br-11'] = lambda b: brotli.compress(b, quality=11)
+
+    for n in [int(x) for x in args.sizes.split(',')]:
+        devices = make_devices(n, rng)
+        print(f"\n== {n} devices ==")
+        print(f"{'encoder':32} {'ms':>9} {'bytes':>10}")
+        body = None
+        for name, encode in encoders.items():
+            seconds, body_out = timed(lambda: encode(devices), args.repeat)
+            print(f"{name:32} {seconds * 1000:9.2f} {len(body_out):10}")
+            body = body_out  # Last one (fastest available) feeds the codecs
+
+        print(f"{'codec':32} {'ms':>9} {'bytes':>10} {'ratio':>7}")
+        for name, compress in codecs.items():
+            seconds, packed = timed(lambda: compress(body), args.repeat)
+            print(f"{name:32} {seconds * 1000:9.2f} {len(packed):10} {len(body) / len(packed):6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
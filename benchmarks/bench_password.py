@@ -0,0 +1,64 @@
+"""
+Login cost per password hashing parameter set.
+
+    python benchmarks/bench_password.py [--methods scrypt:32768:8:1,pbkdf2:sha256:600000] [--logins 64] [--threads 8]
+
+For each PASSWORD_HASH_METHOD prints the time of one hash and one verify, and the
+throughput of a simulated login storm: --logins verifications spread over --threads
+request threads, going through passwords.verify_password (so the per-worker
+PASSWORD_HASH_CONCURRENCY limit applies).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+import passwords
+
+DEFAULT_METHODS = 'scrypt:32768:8:1,scrypt:16384:8:1,pbkdf2:sha256:600000,pbkdf2:sha256:260000'
+
+
+def bench(method, logins, threads, concurrency):
+    app = Flask(__name__)
+    app.config['PASSWORD_HASH_METHOD'] = method
+    if concurrency:
+        app.config['PASSWORD_HASH_CONCURRENCY'] = concurrency
+    passwords.init_app(app)
+
+    with app.app_context():
+        start = time.perf_counter()
+        stored = passwords.hash_password('correct horse battery')
+        hash_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        passwords.verify_password(stored, 'correct horse battery')
+        verify_ms = (time.perf_counter() - start) * 1000
+
+    def login(_):
+        with app.app_context():
+            return passwords.verify_password(stored, 'correct horse battery')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        assert all(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    print(f"{method:<24} hash {hash_ms:7.1f} ms  verify {verify_ms:7.1f} ms  "
+          f"storm {logins / elapsed:7.1f} logins/s ({elapsed:.2f}s for {logins})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', default=DEFAULT_METHODS)
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=None, help='PASSWORD_HASH_CONCURRENCY (default: CPU count)')
+    args = parser.parse_args()
+    for method in args.methods.split(','):
+        bench(method, args.logins, args.threads, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Cost of Flask-Login's user_loader per authenticated request: plain query vs user_cache.
+
+    python benchmarks/bench_user_loader.py [--requests 20000] [--users 20]
+
+Runs against a throwaway SQLite database. Each simulated request loads one user and
+then tears the session down, as Flask-SQLAlchemy does at the end of a request.
+Prints per-request time and SQL statements for each loader, plus the cost of a miss
+right after an epoch bump (password change in another worker).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from models import db, User
+from user_cache import UserCache
+
+
+def make_app(tmp):
+    app = Flask(__name__, instance_path=tmp)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    db.init_app(app)
+    return app
+
+
+def run(label, loader, user_ids, n, statements):
+    rng = random.Random(1)
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(n):
+        loader(rng.choice(user_ids))
+        db.session.remove()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed / n * 1e6:8.1f} us/request  {len(statements) / n:5.2f} queries/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(tmp)
+        cache = UserCache()
+        cache.init_app(app)
+        with app.app_context():
+            db.create_all()
+            db.session.add_all(User(username=f"tech{i}", password_hash='x', role='staff') for i in range(args.users))
+            db.session.commit()
+            user_ids = [u.id for u in User.query.all()]
+
+            statements = []
+            event.listen(db.engine, 'before_cursor_execute', lambda *a: statements.append(a[2]))
+
+            run('query', lambda uid: db.session.get(User, uid), user_ids, args.requests, statements)
+            run('user_cache', cache.get, user_ids, args.requests, statements)
+
+            # Every lookup right after a bump is a miss (stat + query)
+            def bumped(uid):
+                cache.bump(uid)
+                return cache.get(uid)
+            run('after bump', bumped, user_ids, max(args.requests // 10, 1), statements)
+
+
+if __name__ == '__main__':
+    main()
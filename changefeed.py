@@ -0,0 +1,230 @@
+import json
+import queue
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, func
+from models import db, ChangeEvent
+
+POLL_INTERVAL = 1.0          # Seconds between feed reads while streams are open
+RETENTION = timedelta(days=1)
+PRUNE_EVERY = 600            # Seconds
+MAX_QUEUE = 1000             # Per stream; a stream that falls this far behind is told to reload
+BUSY_RETRY = 30              # Seconds a client refused for STREAM_MAX waits before reconnecting
+
+
+# Stats card each (status, archived) pair counts towards, as in /api/stats
+def _stat_buckets(status, archived):
+    if archived:
+        return ['completed']
+    bucket = {
+        'Παραλήφθηκε': 'received',
+        'Υπό Έλεγχο': 'checking',
+        'Υπό Επισκευή': 'repair',
+        'Έτοιμο': 'ready',
+    }.get(status)
+    return ['total', bucket] if bucket else ['total']
+
+
+def stats_delta(before, after):
+    """Card count changes for a device moving from before=(status, archived) to after. None = new device."""
+    delta = {}
+    if before is not None:
+        for key in _stat_buckets(*before):
+            delta[key] = delta.get(key, 0) - 1
+    for key in _stat_buckets(*after):
+        delta[key] = delta.get(key, 0) + 1
+    return {key: value for key, value in delta.items() if value}
+
+
+def record_change(kind, device_id=None, **payload):
+    """Adds a feed event to the current session; it becomes visible when the caller commits."""
+    db.session.add(ChangeEvent(
+        kind=kind,
+        device_id=device_id,
+        payload=json.dumps(payload, ensure_ascii=False, default=str),
+    ))
+
+
+class ChangeFeedHub:
+    """
+    Per-process fan-out of the ChangeEvent table. One background thread reads new rows
+    (id > last seen) once per POLL_INTERVAL while at least one stream is open, and hands
+    them to every subscriber queue. Works across gunicorn workers because the table is
+    the shared source; each worker only runs one cheap indexed query per interval,
+    however many streams it holds.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._lock = threading.Lock()
+        self._subscribers = {}  # device_id (None = every device) -> set of queues
+        self._thread = None
+        self._last_id = 0
+        self._last_prune = 0
+
+    def init_app(self, app):
+        self._app = app
+        app.config.setdefault('STREAM_MAX', 100)
+
+    def _open_streams(self):
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def is_full(self):
+        """True when this process already holds STREAM_MAX open streams (new ones get a 503)."""
+        with self._lock:
+            return self._open_streams() >= self._app.config['STREAM_MAX']
+
+    def head(self):
+        """Id of the newest event in the feed."""
+        return db.session.execute(select(func.coalesce(func.max(ChangeEvent.id), 0))).scalar_one()
+
+    def subscribe(self, device_id=None):
+        """Returns a queue receiving lists of events (optionally only for one device), or None at STREAM_MAX."""
+        sub = queue.Queue(maxsize=MAX_QUEUE)
+        sub.device_id = device_id
+        with self._lock:
+            if self._open_streams() >= self._app.config['STREAM_MAX']:
+                return None
+            if not self._subscribers:
+                self._last_id = self.head()
+            self._subscribers.setdefault(device_id, set()).add(sub)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='changefeed', daemon=True)
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.device_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.device_id]
+
+    def _run(self):
+        with self._app.app_context():
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                try:
+                    self._poll()
+                    self._maybe_prune()
+                except Exception as e:
+                    logging.error(f"Change feed poll error: {e}")
+                finally:
+                    db.session.remove()
+                time.sleep(POLL_INTERVAL)
+
+    def _poll(self):
+        rows = db.session.execute(
+            select(ChangeEvent.id, ChangeEvent.kind, ChangeEvent.device_id, ChangeEvent.payload)
+            .where(ChangeEvent.id > self._last_id)
+            .order_by(ChangeEvent.id)
+            .limit(500)
+        ).all()
+        if not rows:
+            return
+        self._last_id = rows[-1].id
+
+        by_device = {}
+        for row in rows:
+            by_device.setdefault(row.device_id, []).append(row)
+
+        with self._lock:
+            targets = [(sub, rows) for sub in self._subscribers.get(None, ())]
+            for device_id, device_rows in by_device.items():
+                if device_id is not None:
+                    targets.extend((sub, device_rows) for sub in self._subscribers.get(device_id, ()))
+
+        for sub, events in targets:
+            try:
+                sub.put_nowait(events)
+            except queue.Full:
+                # Slow consumer: drop its backlog and ask it to resync
+                with sub.mutex:
+                    sub.queue.clear()
+                sub.put_nowait(None)
+
+    def _maybe_prune(self):
+        now = time.time()
+        if now - self._last_prune < PRUNE_EVERY:
+            return
+        self._last_prune = now
+        db.session.execute(delete(ChangeEvent).where(ChangeEvent.created_at < datetime.utcnow() - RETENTION))
+        db.session.commit()
+
+
+hub = ChangeFeedHub()
+
+
+def read_since(last_id, device_id=None, limit=500):
+    """Events after last_id straight from the table (reconnect backfill)."""
+    stmt = (
+        select(ChangeEvent.id, ChangeEvent.kind, ChangeEvent.device_id, ChangeEvent.payload)
+        .where(ChangeEvent.id > last_id)
+        .order_by(ChangeEvent.id)
+        .limit(limit)
+    )
+    if device_id is not None:
+        stmt = stmt.where(ChangeEvent.device_id == device_id)
+    return db.session.execute(stmt).all()
+
+
+def format_sse(event_id, kind, data):
+    return f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n"
+
+
+def _as_is(event):
+    return event.kind, event.payload
+
+
+def iter_sse(last_event_id=None, device_id=None, transform=_as_is, keepalive=15, max_duration=300):
+    """
+    SSE body for one client. Replays events after Last-Event-ID, then streams live ones.
+    transform(event) -> (kind, data) or None to skip (e.g. strip private fields).
+    The stream ends after max_duration so a worker isn't held forever; EventSource
+    reconnects on its own and resumes from the last id it saw.
+    """
+    sub = hub.subscribe(device_id)
+    if sub is None:
+        # Lost the race for the last slot after the view's is_full() check: ask the client to come back later
+        yield f'retry: {BUSY_RETRY * 1000}\n\n'
+        return
+
+    def render(events):
+        for event in events:
+            message = transform(event)
+            if message is not None:
+                yield format_sse(event.id, *message)
+
+    try:
+        delivered = hub.head() if last_event_id is None else last_event_id
+        db.session.remove()  # Don't keep a connection checked out while idle
+        yield 'retry: 3000\n\n'
+        if last_event_id is not None:
+            backlog = read_since(last_event_id, device_id)
+            db.session.remove()
+            if backlog:
+                delivered = backlog[-1].id
+            yield from render(backlog)
+
+        deadline = time.monotonic() + max_duration
+        while time.monotonic() < deadline:
+            try:
+                events = sub.get(timeout=keepalive)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if events is None:
+                yield 'event: resync\ndata: {}\n\n'
+                continue
+            fresh = [event for event in events if event.id > delivered]
+            if fresh:
+                delivered = fresh[-1].id
+                yield from render(fresh)
+    finally:
+        hub.unsubscribe(sub)
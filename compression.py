@@ -0,0 +1,52 @@
+import gzip
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIMETYPES = ('application/json', 'text/csv', 'text/html', 'application/x-ndjson')
+
+
+def compress_response(response):
+    """after_request hook: gzip/brotli-encode buffered responses above COMPRESS_MIN_SIZE."""
+    config = current_app.config
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(['br', 'gzip'] if brotli else ['gzip'])
+    if not encoding:
+        return response
+
+    data = response.get_data()
+    if len(data) < config['COMPRESS_MIN_SIZE']:
+        return response
+
+    if encoding == 'br':
+        data = brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    else:
+        data = gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """
+    Negotiated compression for API responses. Settings:
+    COMPRESS_MIN_SIZE (bytes, default 1024), COMPRESS_GZIP_LEVEL (6),
+    COMPRESS_BROTLI_QUALITY (4: fast enough per request), COMPRESS_MIMETYPES.
+    Brotli is used when the `brotli` package is installed and the client accepts it.
+    Streamed responses (exports, SSE) are left alone.
+    """
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+    app.config.setdefault('COMPRESS_MIMETYPES', set(DEFAULT_MIMETYPES))
+    app.after_request(compress_response)
@@ -0,0 +1,208 @@
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func
+from models import db, User, Customer, Device, TimelineLog, NotificationLog, log_fingerprint
+from tracking_ids import allocate_tracking_ids
+from listing import refresh_listings
+from passwords import hash_password
+
+DEFAULT_BATCH_SIZE = 5000
+
+MALE_NAMES = ['Γιώργος', 'Δημήτρης', 'Κωνσταντίνος', 'Νίκος', 'Παναγιώτης', 'Βασίλης', 'Χρήστος', 'Αθανάσιος',
+              'Μιχάλης', 'Ευάγγελος', 'Σπύρος', 'Αντώνης', 'Ιωάννης', 'Σταύρος', 'Θοδωρής', 'Ανδρέας']
+FEMALE_NAMES = ['Μαρία', 'Ελένη', 'Αικατερίνη', 'Βασιλική', 'Σοφία', 'Αγγελική', 'Γεωργία', 'Δήμητρα',
+                'Κωνσταντίνα', 'Παρασκευή', 'Ευαγγελία', 'Χριστίνα', 'Ειρήνη', 'Αναστασία', 'Δέσποινα', 'Νικολέτα']
+# (male form, female form)
+SURNAMES = [('Παπαδόπουλος', 'Παπαδοπούλου'), ('Παπαγεωργίου', 'Παπαγεωργίου'), ('Οικονόμου', 'Οικονόμου'),
+            ('Γεωργίου', 'Γεωργίου'), ('Παπαδημητρίου', 'Παπαδημητρίου'), ('Ιωάννου', 'Ιωάννου'),
+            ('Βασιλείου', 'Βασιλείου'), ('Νικολάου', 'Νικολάου'), ('Μακρής', 'Μακρή'), ('Καραγιάννης', 'Καραγιάννη'),
+            ('Αλεξίου', 'Αλεξίου'), ('Δημητρίου', 'Δημητρίου'), ('Κωνσταντίνου', 'Κωνσταντίνου'),
+            ('Πετρόπουλος', 'Πετροπούλου'), ('Αντωνίου', 'Αντωνίου'), ('Μαυρίδης', 'Μαυρίδου'),
+            ('Χατζής', 'Χατζή'), ('Σταθόπουλος', 'Σταθοπούλου'), ('Λαμπρόπουλος', 'Λαμπροπούλου'), ('Ραφαηλίδης', 'Ραφαηλίδου')]
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.gr', 'hotmail.com', 'otenet.gr']
+
+# brand -> (weight, models)
+DEVICES = {
+    'Apple': (34, ['iPhone 11', 'iPhone 12', 'iPhone 13', 'iPhone 14', 'iPhone 15', 'iPhone SE', 'iPad 9']),
+    'Samsung': (30, ['Galaxy S21', 'Galaxy S22', 'Galaxy S23', 'Galaxy A52', 'Galaxy A53', 'Galaxy A14', 'Galaxy Tab A8']),
+    'Xiaomi': (13, ['Redmi Note 11', 'Redmi Note 12', 'Redmi 10', 'Poco X5', 'Xiaomi 12T']),
+    'Huawei': (7, ['P30', 'P30 Lite', 'Y6', 'Nova 9']),
+    'Motorola': (5, ['Moto G32', 'Moto G54', 'Edge 30']),
+    'OnePlus': (4, ['Nord 2', 'OnePlus 9']),
+    'Google': (3, ['Pixel 6a', 'Pixel 7']),
+    'Realme': (4, ['Realme 9', 'Realme C35']),
+}
+FAULTS = ['Σπασμένη οθόνη', 'Δεν φορτίζει', 'Η μπαταρία αδειάζει γρήγορα', 'Δεν ανάβει', 'Έπεσε στο νερό',
+          'Χαλασμένη θύρα φόρτισης', 'Δεν ακούγεται στις κλήσεις', 'Κολλάει/επανεκκινείται μόνο του',
+          'Σπασμένο πίσω τζάμι', 'Δεν λειτουργεί η κάμερα', 'Πρόβλημα με το touch', 'Αλλαγή μπαταρίας']
+PROGRESS_NOTES = ['Αναμονή ανταλλακτικού', 'Παραγγέλθηκε ανταλλακτικό', 'Έγινε διάγνωση', 'Επικοινωνία με πελάτη']
+
+# Status -> (public note, hours until the next status: min, max)
+LIFECYCLE = [
+    ('Παραλήφθηκε', 'Device registered', (1, 24)),
+    ('Υπό Έλεγχο', 'Η συσκευή ελέγχεται', (2, 48)),
+    ('Υπό Επισκευή', 'Η επισκευή ξεκίνησε', (12, 120)),
+    ('Έτοιμο', 'Η συσκευή είναι έτοιμη για παραλαβή', (24, 336)),
+    ('Αρχείο', 'Παραδόθηκε', None),
+]
+READY_MESSAGE = 'Αγαπητέ/ή {name}, η συσκευή σας {model} ({tracking_id}) είναι έτοιμη για παραλαβή.'
+
+
+class ShopDataGenerator:
+    """
+    Seeded synthetic workload: Greek customers, weighted brand/model mix, devices that
+    walk the status lifecycle with realistic gaps (recent devices are still in progress,
+    older ones archived), the staff who handled them and the "ready" notifications.
+    Rows are written with core executemany inserts, batch_size devices per transaction.
+    Timelines end at `now` (default: the current time); pass a fixed one for reproducible data.
+    """
+
+    def __init__(self, seed=1, days=365, staff=8, now=None):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.staff = staff
+        self.now = now or datetime.utcnow()
+        self._brands = list(DEVICES)
+        self._brand_weights = [DEVICES[b][0] for b in self._brands]
+
+    # --- Rows ---
+    def customer(self, index):
+        rng = self.rng
+        female = rng.random() < 0.5
+        first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+        surname = rng.choice(SURNAMES)[1 if female else 0]
+        # Unique mobile number per index: 69 + 8 digits (index scrambled over the space)
+        phone = f"69{(index * 48271 + 12345) % 10 ** 8:08d}"
+        email = None
+        if rng.random() < 0.3:
+            email = f"user{index}@{rng.choice(EMAIL_DOMAINS)}"
+        return {'name': f"{first} {surname}", 'phone': phone, 'email': email}
+
+    def device_history(self, staff_ids):
+        """(fields, logs, ready_at) for one device; logs are (status, public, private, time, user)."""
+        rng = self.rng
+        brand = rng.choices(self._brands, self._brand_weights)[0]
+        created = self.now - timedelta(seconds=rng.randrange(self.days * 86400))
+        creator = rng.choice(staff_ids)
+        technician = None
+
+        logs = []
+        moment = created
+        ready_at = None
+        for status, note, gap in LIFECYCLE:
+            if moment > self.now:
+                break
+            user = creator if status == 'Παραλήφθηκε' else (technician or rng.choice(staff_ids))
+            if status == 'Υπό Επισκευή':
+                technician = user
+            logs.append((status, note, '', moment, user))
+            if status == 'Υπό Επισκευή' and rng.random() < 0.25:
+                # Waiting on a part: an extra same-status update with a private note
+                extra = moment + timedelta(hours=rng.uniform(1, 48))
+                if extra <= self.now:
+                    logs.append((status, note, rng.choice(PROGRESS_NOTES), extra, user))
+                    moment = extra
+            if status == 'Έτοιμο':
+                ready_at = moment
+            if gap is None:
+                break
+            moment = moment + timedelta(hours=rng.uniform(*gap))
+
+        status = logs[-1][0]
+        fields = {
+            'brand': brand,
+            'model': rng.choice(DEVICES[brand][1]),
+            'description': rng.choice(FAULTS),
+            'status': status,
+            'is_archived': status == 'Αρχείο',
+            'created_at': created,
+            'created_by_id': creator,
+            'technician_id': technician,
+        }
+        return fields, logs, ready_at
+
+    # --- Writing ---
+    def ensure_staff(self):
+        existing = db.session.scalars(select(User.id).where(User.username.like('tech%'))).all()
+        missing = self.staff - len(existing)
+        if missing > 0:
+            password = hash_password('tech12345')  # One hash for all generated accounts
+            start = len(existing) + 1
+            db.session.execute(insert(User), [{
+                'username': f"tech{start + i}", 'password_hash': password, 'role': 'staff',
+                'is_first_login': False, 'created_at': self.now,
+            } for i in range(missing)])
+            db.session.commit()
+        return db.session.scalars(select(User.id).where(User.username.like('tech%'))).all()
+
+    def generate(self, devices, customers=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Writes `devices` devices for `customers` customers (default 70% of devices). Returns row counts."""
+        started = time.perf_counter()
+        customers = customers or max(1, devices * 7 // 10)
+        staff_ids = self.ensure_staff()
+        counts = {'customers': 0, 'devices': 0, 'logs': 0, 'notifications': 0}
+
+        # Explicit ids continue after the current maximum, so rows can reference each other without RETURNING
+        first_customer = (db.session.scalar(select(func.max(Customer.id))) or 0) + 1
+        existing_phones = set(db.session.scalars(select(Customer.phone)))
+        customer_rows = []
+        for i in range(customers):
+            row = self.customer(first_customer + i)
+            if row['phone'] in existing_phones:
+                continue
+            row.update(id=first_customer + i, created_at=self.now)
+            customer_rows.append(row)
+        customer_ids = [row['id'] for row in customer_rows] or list(db.session.scalars(select(Customer.id).limit(1000)))
+        names = {row['id']: row['name'] for row in customer_rows}
+        for offset in range(0, len(customer_rows), batch_size):
+            db.session.execute(insert(Customer), customer_rows[offset:offset + batch_size])
+            db.session.commit()
+        counts['customers'] = len(customer_rows)
+
+        next_device = (db.session.scalar(select(func.max(Device.id))) or 0) + 1
+        remaining = devices
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            tracking_ids = allocate_tracking_ids(size)
+            device_rows, log_rows, notification_rows = [], [], []
+            for offset, tracking_id in enumerate(tracking_ids):
+                device_id = next_device + offset
+                fields, logs, ready_at = self.device_history(staff_ids)
+                customer_id = self.rng.choice(customer_ids)
+                last = logs[-1]
+                fields.update(
+                    id=device_id, tracking_id=tracking_id, customer_id=customer_id,
+                    last_log_at=last[3],
+                    last_log_fingerprint=log_fingerprint(last[0], last[1], last[2]),
+                )
+                device_rows.append(fields)
+                log_rows.extend({
+                    'device_id': device_id, 'status': status, 'public_note': public, 'note': public,
+                    'private_note': private, 'timestamp': moment, 'user_id': user,
+                } for status, public, private, moment, user in logs)
+                if ready_at is not None:
+                    sent = self.rng.random() < 0.95
+                    message = READY_MESSAGE.format(name=names.get(customer_id, ''), model=fields['model'], tracking_id=tracking_id)
+                    notification_rows.append({
+                        'device_id': device_id, 'channel': 'SMS', 'status': 'SENT' if sent else 'FAILED',
+                        'message_content': message if sent else 'Err: HTTP 500', 'timestamp': ready_at,
+                    })
+
+            db.session.execute(insert(Device), device_rows)
+            db.session.execute(insert(TimelineLog), log_rows)
+            if notification_rows:
+                db.session.execute(insert(NotificationLog), notification_rows)
+            refresh_listings(db.session, Device.id.between(next_device, next_device + size - 1))
+            db.session.commit()
+
+            counts['devices'] += size
+            counts['logs'] += len(log_rows)
+            counts['notifications'] += len(notification_rows)
+            next_device += size
+            remaining -= size
+            if progress:
+                progress(counts)
+
+        counts['elapsed'] = round(time.perf_counter() - started, 1)
+        return counts
@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from models import db, Device, Customer, User, TimelineLog, NotificationLog
+
+DEFAULT_CHUNK_SIZE = 1000
+INCLUDE_OPTIONS = ('timeline', 'notifications')
+
+DEVICE_FIELDS = [
+    'tracking_id', 'customer_name', 'phone', 'email', 'brand', 'model', 'description',
+    'technician_notes', 'status', 'is_archived', 'created_at', 'technician', 'created_by',
+]
+
+
+def parse_period(month=None, date_from=None, date_to=None):
+    """Returns (start, end) datetimes from ?month=YYYY-MM or ?from=/&to=YYYY-MM-DD (end exclusive)."""
+    if month:
+        start = datetime.strptime(month, '%Y-%m')
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        return start, end
+    start = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+    end = datetime.strptime(date_to, '%Y-%m-%d') if date_to else None
+    return start, end
+
+
+def _fmt(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S') if dt else None
+
+
+def _load_timelines(device_ids):
+    logs = defaultdict(list)
+    author = aliased(User)
+    rows = db.session.execute(
+        select(TimelineLog.device_id, TimelineLog.status, TimelineLog.public_note, TimelineLog.note,
+               TimelineLog.private_note, TimelineLog.timestamp, author.username)
+        .outerjoin(author, TimelineLog.user_id == author.id)
+        .where(TimelineLog.device_id.in_(device_ids))
+        .order_by(TimelineLog.device_id, TimelineLog.timestamp)
+    )
+    for device_id, status, public_note, note, private_note, timestamp, username in rows:
+        logs[device_id].append({
+            'status': status,
+            'public_note': public_note or note,
+            'private_note': private_note,
+            'timestamp': _fmt(timestamp),
+            'user': username or 'System',
+        })
+    return logs
+
+
+def _load_notifications(device_ids):
+    notifications = defaultdict(list)
+    rows = db.session.execute(
+        select(NotificationLog.device_id, NotificationLog.channel, NotificationLog.status,
+               NotificationLog.message_content, NotificationLog.timestamp)
+        .where(NotificationLog.device_id.in_(device_ids))
+        .order_by(NotificationLog.device_id, NotificationLog.timestamp)
+    )
+    for device_id, channel, status, message, timestamp in rows:
+        notifications[device_id].append({
+            'channel': channel,
+            'status': status,
+            'message': message,
+            'timestamp': _fmt(timestamp),
+        })
+    return notifications
+
+
+def iter_device_records(start=None, end=None, include=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields one dict per device (joined with customer and staff names), oldest first.
+    Devices are read through a server-side cursor in chunks of chunk_size; timelines and
+    notifications are fetched with one IN query per chunk, so memory stays flat.
+    """
+    technician = aliased(User)
+    creator = aliased(User)
+    stmt = (
+        select(Device.id, Device.tracking_id, Customer.name, Customer.phone, Customer.email,
+               Device.brand, Device.model, Device.description, Device.technician_notes,
+               Device.status, Device.is_archived, Device.created_at,
+               technician.username, creator.username)
+        .join(Customer, Device.customer_id == Customer.id)
+        .outerjoin(technician, Device.technician_id == technician.id)
+        .outerjoin(creator, Device.created_by_id == creator.id)
+        .order_by(Device.id)
+    )
+    if start:
+        stmt = stmt.where(Device.created_at >= start)
+    if end:
+        stmt = stmt.where(Device.created_at < end)
+
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    for chunk in result.partitions():
+        device_ids = [row[0] for row in chunk]
+        timelines = _load_timelines(device_ids) if 'timeline' in include else None
+        notifications = _load_notifications(device_ids) if 'notifications' in include else None
+
+        for row in chunk:
+            record = dict(zip(DEVICE_FIELDS, row[1:]))
+            record['created_at'] = _fmt(record['created_at'])
+            record['is_archived'] = bool(record['is_archived'])
+            if timelines is not None:
+                record['timeline'] = timelines.get(row[0], [])
+            if notifications is not None:
+                record['notifications'] = notifications.get(row[0], [])
+            yield record
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def iter_csv(records, include=()):
+    """CSV lines; nested timeline/notifications go into JSON-encoded columns."""
+    columns = DEVICE_FIELDS + [option for option in INCLUDE_OPTIONS if option in include]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def line(values):
+        writer.writerow(values)
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    # BOM so Excel opens Greek text as UTF-8
+    yield '\ufeff' + line(columns)
+    for record in records:
+        values = []
+        for column in columns:
+            value = record.get(column)
+            if isinstance(value, list):
+                value = json.dumps(value, ensure_ascii=False)
+            values.append(value)
+        yield line(values)
+
+
+def iter_export(fmt, start=None, end=None, include=()):
+    records = iter_device_records(start, end, include)
+    if fmt == 'ndjson':
+        return iter_ndjson(records)
+    return iter_csv(records, include)
@@ -0,0 +1,53 @@
+import os
+import sys
+import glob
+import subprocess
+
+# Loaded automatically by `gunicorn app:app` (see Procfile).
+#
+# The live streams (/api/events/stream, /track/stream) keep connections open for
+# minutes. With sync workers every idle stream pins a whole worker, so use gevent
+# when it is installed: a waiting customer then costs one greenlet, not a process.
+try:
+    import gevent  # noqa: F401
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '2000'))
+    os.environ.setdefault('STREAM_MAX_PER_WORKER', str(worker_connections // 2))
+except ImportError:
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+    threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+    # Each open stream holds one of those threads: keep half of them for normal requests
+    # (further streams get a 503 and retry later; see STREAM_MAX in changefeed.py)
+    os.environ.setdefault('STREAM_MAX_PER_WORKER', str(max(1, threads // 2)))
+
+# Workers (and the init-db/assets subprocesses below) send their log records to the
+# master over this socket, and only the master writes LOG_FILE: size/time rotation then
+# has a single process renaming the file, however many workers there are.
+_here = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault('LOG_SOCKET', os.path.join(_here, 'instance', 'log.sock'))
+
+# Streams end themselves after 5 minutes (EventSource reconnects); keep the
+# worker timeout above that for non-async worker classes.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '330'))
+
+
+def on_starting(server):
+    sys.path.insert(0, _here)
+    import logging_setup  # Not the app: only the logging helpers
+    os.makedirs(os.path.dirname(os.environ['LOG_SOCKET']), exist_ok=True)
+    server.log_handler = logging_setup.start_receiver(logging_setup.config_from_env(), os.environ['LOG_SOCKET'])
+
+    # Create/upgrade the schema once, before any worker boots. Run in a child process so the
+    # master never imports the app (forked workers would inherit its DB connections and threads).
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=_here, check=True)
+    # Fingerprinted static files + manifest for asset_url() (cheap, and always matches the deployed code)
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'assets', 'build'], cwd=_here, check=True)
+
+    # Metrics are summed over per-worker files (metrics.py); start each server run from zero
+    metrics_dir = os.environ.get('METRICS_DIR', os.path.join(_here, 'instance', 'metrics'))
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+
+
+def on_exit(server):
+    server.log_handler.close()
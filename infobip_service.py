@@ -1,7 +1,10 @@
-import requests
+import time
 import logging
+import metrics
 from models import SystemSetting, NotificationLog, db
 
+REQUEST_TIMEOUT = (5, 15) # Seconds (connect, read) per Infobip API call
+
 class InfobipService:
     @staticmethod
     def send_notification(device, trigger_type='ready'):
@@ -15,33 +18,12 @@ class InfobipService:
             return False, "No settings"
 
         # 1. Determine Message Content & Recipient
-        # Template selection based on trigger
-        template = ""
-        if trigger_type == 'registration':
-            template = settings.template_registration
-        elif trigger_type == 'ready':
-            template = settings.template_ready
-        elif trigger_type == 'delivered':
-            template = settings.template_delivered
-        
+        template = InfobipService._template_for(settings, trigger_type)
         if not template:
             return False, "No template"
 
-        try:
-            message_text = template.format(
-                customer_name=device.customer.name,
-                model=device.model,
-                tracking_id=device.tracking_id,
-                status=device.status
-            )
-        except Exception as e:
-            logging.error(f"Infobip Template Error: {e}")
-            message_text = template # Fallback
-
-        # Normalize Phone (Greece Default)
-        phone = device.customer.phone.replace(" ", "")
-        if not phone.startswith("+"):
-            phone = "+30" + phone if not phone.startswith("00") else "+" + phone.lstrip("00")
+        message_text = InfobipService._render(template, device)
+        phone = InfobipService._normalize_phone(device.customer.phone)
 
         # 2. Dispatch based on Active Channel
         channel = settings.active_channel # sms, whatsapp, viber
@@ -75,6 +57,132 @@ class InfobipService:
 
         return success, error_msg
 
+    @staticmethod
+    def send_batch(devices, trigger_type='ready'):
+        """
+        Sends the same trigger to many devices (bulk status updates).
+        Settings are loaded once, SMS go out in a single API request and
+        all NotificationLogs are written in one commit.
+        """
+        if not devices:
+            return []
+
+        settings = SystemSetting.query.first()
+        if not settings:
+            logging.warning("Infobip Warning: No settings found.")
+            return []
+
+        template = InfobipService._template_for(settings, trigger_type)
+        if not template:
+            return []
+
+        messages = [(
+            device,
+            InfobipService._normalize_phone(device.customer.phone),
+            InfobipService._render(template, device)
+        ) for device in devices]
+
+        channel = settings.active_channel
+        if channel == 'sms':
+            results = InfobipService._send_sms_batch(settings, messages)
+        elif channel == 'whatsapp':
+            results = [InfobipService._send_whatsapp(settings, phone, device) for device, phone, _ in messages]
+        elif channel == 'viber':
+            results = [InfobipService._send_viber(settings, phone, text) for _, phone, text in messages]
+        else:
+            logging.warning(f"Infobip Warning: Unknown channel: {channel}")
+            return []
+
+        try:
+            for (device, _, text), (success, error_msg) in zip(messages, results):
+                db.session.add(NotificationLog(
+                    device_id=device.id,
+                    channel=channel.upper(),
+                    status='SENT' if success else 'FAILED',
+                    message_content=text if success else f"Err: {error_msg}"
+                ))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Logging Error: {e}")
+
+        return results
+
+    @staticmethod
+    def _template_for(settings, trigger_type):
+        # Template selection based on trigger
+        if trigger_type == 'registration':
+            return settings.template_registration
+        elif trigger_type == 'ready':
+            return settings.template_ready
+        elif trigger_type == 'delivered':
+            return settings.template_delivered
+        return ""
+
+    @staticmethod
+    def _render(template, device):
+        try:
+            return template.format(
+                customer_name=device.customer.name,
+                model=device.model,
+                tracking_id=device.tracking_id,
+                status=device.status
+            )
+        except Exception as e:
+            logging.error(f"Infobip Template Error: {e}")
+            return template # Fallback
+
+    @staticmethod
+    def _normalize_phone(phone):
+        # Normalize Phone (Greece Default)
+        phone = phone.replace(" ", "")
+        if not phone.startswith("+"):
+            phone = "+30" + phone if not phone.startswith("00") else "+" + phone.lstrip("00")
+        return phone
+
+    @staticmethod
+    def _post(channel, url, payload, headers):
+        """requests.post with the call latency recorded per channel (see metrics.py)."""
+        import requests # Imported on the first notification, not at worker boot
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = requests.post(url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
+            outcome = str(response.status_code)
+            return response
+        finally:
+            metrics.observe_infobip(channel, time.perf_counter() - started, outcome)
+
+    @staticmethod
+    def _send_sms_batch(settings, messages):
+        """One /sms/2/text/advanced request carrying every message. Returns [(success, error)] per message."""
+        if not settings.infobip_api_key_sms or not settings.infobip_base_url_sms:
+            return [(False, "SMS Credentials missing")] * len(messages)
+
+        url = f"https://{settings.infobip_base_url_sms}/sms/2/text/advanced"
+        headers = {
+            'Authorization': f'App {settings.infobip_api_key_sms}',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        payload = {
+            "messages": [
+                {
+                    "destinations": [{"to": phone}],
+                    "from": settings.infobip_sender_id_sms or "InfoSMS",
+                    "text": text
+                } for _, phone, text in messages
+            ]
+        }
+
+        try:
+            response = InfobipService._post('sms', url, payload, headers)
+            if response.status_code == 200:
+                return [(True, None)] * len(messages)
+            return [(False, f"HTTP {response.status_code}: {response.text}")] * len(messages)
+        except Exception as e:
+            return [(False, str(e))] * len(messages)
+
     @staticmethod
     def _send_sms(settings, phone, text):
         if not settings.infobip_api_key_sms or not settings.infobip_base_url_sms:
@@ -97,7 +205,7 @@ class InfobipService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = InfobipService._post('sms', url, payload, headers)
             if response.status_code == 200:
                 return True, None
             return False, f"HTTP {response.status_code}: {response.text}"
@@ -146,7 +254,7 @@ class InfobipService:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = InfobipService._post('whatsapp', url, payload, headers)
             # 200 OK means received by Infobip
             if response.status_code == 200:
                 return True, None
@@ -172,7 +280,7 @@ class InfobipService:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = InfobipService._post('viber', url, payload, headers)
             if response.status_code == 200:
                 return True, None
             return False, f"HTTP {response.status_code}: {response.text}"
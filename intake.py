@@ -0,0 +1,45 @@
+from sqlalchemy import func
+from models import db, Customer, Device
+from listing import refresh_listings
+
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support for the active database."""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def upsert_customers(rows):
+    """
+    Inserts or updates customers keyed by phone in one statement.
+    rows: iterable of dicts with name, phone and optional email.
+    Name is overwritten, email only when a new one is given (same rules as add_device).
+    Returns {phone: customer_id}.
+    """
+    # Last row wins for repeated phones (ON CONFLICT can't touch a row twice per statement)
+    by_phone = {}
+    for row in rows:
+        by_phone[row['phone']] = {
+            'name': row['name'],
+            'phone': row['phone'],
+            'email': row.get('email') or None,
+        }
+    if not by_phone:
+        return {}
+
+    stmt = dialect_insert(Customer).values(list(by_phone.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Customer.phone],
+        set_={
+            'name': stmt.excluded.name,
+            'email': func.coalesce(stmt.excluded.email, Customer.email),
+        },
+    ).returning(Customer.id, Customer.phone)
+
+    ids = {phone: customer_id for customer_id, phone in db.session.execute(stmt)}
+    # Core statement: bypasses the ORM flush hook, so existing cards pick up renames here
+    refresh_listings(db.session, Device.customer_id.in_(ids.values()))
+    return ids
@@ -0,0 +1,101 @@
+from datetime import datetime
+from sqlalchemy import select, insert, delete, literal, or_, event
+from sqlalchemy.orm import aliased
+from models import db, Device, Customer, User, DeviceListing
+
+# Listing column -> source expression (Device joined with its customer and staff names)
+_technician = aliased(User)
+_creator = aliased(User)
+SOURCE_COLUMNS = {
+    'device_id': Device.id,
+    'tracking_id': Device.tracking_id,
+    'customer_name': Customer.name,
+    'phone': Customer.phone,
+    'brand': Device.brand,
+    'model': Device.model,
+    'description': Device.description,
+    'status': Device.status,
+    'is_archived': Device.is_archived,
+    'technician_id': Device.technician_id,
+    'technician': _technician.username,
+    'created_by_id': Device.created_by_id,
+    'created_by': _creator.username,
+    'created_at': Device.created_at,
+}
+
+
+def refresh_listings(conn, condition):
+    """
+    Rewrites the listing rows of every device matching `condition` (a Device filter)
+    from the source tables. conn is a Session or Connection; runs in its transaction.
+    """
+    now = datetime.utcnow()
+    source = (
+        select(*SOURCE_COLUMNS.values(), literal(now, db.DateTime))
+        .select_from(Device)
+        .join(Customer, Device.customer_id == Customer.id)
+        .outerjoin(_technician, Device.technician_id == _technician.id)
+        .outerjoin(_creator, Device.created_by_id == _creator.id)
+        .where(condition)
+    )
+    conn.execute(delete(DeviceListing).where(
+        DeviceListing.device_id.in_(select(Device.id).where(condition))
+    ))
+    conn.execute(insert(DeviceListing).from_select(list(SOURCE_COLUMNS) + ['listed_at'], source))
+
+
+def remove_listings(conn, device_ids):
+    conn.execute(delete(DeviceListing).where(DeviceListing.device_id.in_(device_ids)))
+
+
+def rebuild_listings():
+    """Recreates the whole projection (first run on an existing database, or after manual SQL)."""
+    db.session.execute(delete(DeviceListing))
+    refresh_listings(db.session, Device.id.isnot(None))
+    db.session.commit()
+
+
+def _changed(obj, *attrs):
+    state = db.inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _after_flush(session, flush_context):
+    # ORM writes: new/edited devices, renamed customers and staff. Core bulk statements
+    # bypass this hook and refresh explicitly (bulk_import.py, intake.py).
+    device_ids, customer_ids, user_ids, removed = set(), set(), set(), set()
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Device):
+            device_ids.add(obj.id)
+        elif obj in session.new:
+            continue  # A new customer or user has no devices yet
+        elif isinstance(obj, Customer) and _changed(obj, 'name', 'phone'):
+            customer_ids.add(obj.id)
+        elif isinstance(obj, User) and _changed(obj, 'username'):
+            user_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Device):
+            removed.add(obj.id)
+        elif isinstance(obj, User):
+            user_ids.add(obj.id)
+
+    conn = session.connection()
+    if removed:
+        remove_listings(conn, removed)
+        device_ids -= removed
+
+    conditions = []
+    if device_ids:
+        conditions.append(Device.id.in_(device_ids))
+    if customer_ids:
+        conditions.append(Device.customer_id.in_(customer_ids))
+    if user_ids:
+        conditions.append(Device.technician_id.in_(user_ids))
+        conditions.append(Device.created_by_id.in_(user_ids))
+    if conditions:
+        refresh_listings(conn, or_(*conditions))
+
+
+def init_app(app):
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import uuid
+import queue
+import atexit
+import pickle
+import socket
+import threading
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+from flask import g, request, has_request_context
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s]: %(message)s'
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')  # Accepted from X-Request-ID (e.g. set by nginx)
+
+RECEIVE_BUFFER = 1024 * 1024  # Largest record datagram accepted by the receiver
+
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps every record with the current request's correlation id ('-' outside requests)."""
+
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def config_from_env():
+    """LOG_* settings from the environment: read by app.py and by the gunicorn master (which never loads the app)."""
+    return {
+        'LOG_FILE': os.environ.get('LOG_FILE', 'app.log'),
+        'LOG_FORMAT': os.environ.get('LOG_FORMAT', 'text'),  # text | json
+        'LOG_MAX_BYTES': int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),  # 0 = external rotation (logrotate)
+        'LOG_ROTATE_WHEN': os.environ.get('LOG_ROTATE_WHEN'),  # e.g. midnight (time-based rotation instead)
+        'LOG_SOCKET': os.environ.get('LOG_SOCKET'),  # Set by gunicorn.conf.py: send records to the master
+    }
+
+
+def _set_defaults(config):
+    config.setdefault('LOG_FILE', 'app.log')
+    config.setdefault('LOG_LEVEL', 'INFO')
+    config.setdefault('LOG_FORMAT', 'text')
+    config.setdefault('LOG_MAX_BYTES', 10 * 1024 * 1024)
+    config.setdefault('LOG_BACKUP_COUNT', 5)
+    config.setdefault('LOG_ROTATE_WHEN', None)
+    config.setdefault('LOG_SOCKET', None)
+
+
+def _file_handler(config):
+    path = config['LOG_FILE']
+    if config['LOG_ROTATE_WHEN']:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=config['LOG_ROTATE_WHEN'], backupCount=config['LOG_BACKUP_COUNT'], encoding='utf-8')
+    if config['LOG_MAX_BYTES']:
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=config['LOG_MAX_BYTES'], backupCount=config['LOG_BACKUP_COUNT'], encoding='utf-8')
+    # 0 = rotation left to an external tool (logrotate); reopens the file when it is moved
+    return logging.handlers.WatchedFileHandler(path, encoding='utf-8')
+
+
+def _output_handler(config):
+    if config['LOG_SOCKET']:
+        # One datagram per record to the receiver in the gunicorn master (see start_receiver)
+        return logging.handlers.DatagramHandler(config['LOG_SOCKET'], None)
+    handler = _file_handler(config)
+    handler.setFormatter(JsonFormatter() if config['LOG_FORMAT'] == 'json' else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def start_receiver(config, path):
+    """
+    Makes this process (the gunicorn master) the only writer of LOG_FILE: workers started
+    with LOG_SOCKET=path send their records here, and a receiver thread writes them. Size
+    and time rotation are then safe with any number of workers, since one process renames
+    the file. The socket is owner-only: records arrive pickled. Returns the file handler.
+    """
+    config = dict(config, LOG_SOCKET=None)
+    _set_defaults(config)
+    handler = _output_handler(config)
+    if os.path.exists(path):
+        os.remove(path)  # Left by a previous run
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(path)
+    os.chmod(path, 0o600)
+
+    def receive():
+        while True:
+            data = sock.recv(RECEIVE_BUFFER)
+            try:
+                # DatagramHandler framing: 4-byte length, then the pickled record attributes
+                handler.handle(logging.makeLogRecord(pickle.loads(data[4:])))
+            except Exception:
+                handler.handleError(None)
+    threading.Thread(target=receive, name='log-receiver', daemon=True).start()
+    return handler
+
+
+def _assign_request_id():
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex[:16]
+
+
+def _echo_request_id(response):
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    return response
+
+
+def init_app(app):
+    """
+    Routes the root logger through a queue: request threads only enqueue records, and a
+    background listener thread does the file I/O, so a slow disk never adds request latency.
+
+    Settings: LOG_FILE (app.log), LOG_LEVEL (INFO), LOG_FORMAT ('text' or 'json' lines),
+    LOG_MAX_BYTES (10 MB per file; 0 = no size rotation), LOG_BACKUP_COUNT (5),
+    LOG_ROTATE_WHEN (e.g. 'midnight': rotate by time instead of size), LOG_SOCKET (send
+    records to start_receiver instead of writing LOG_FILE; set by gunicorn.conf.py).
+    Each request gets a correlation id (incoming X-Request-ID or a new one), included in
+    every log line and echoed in the X-Request-ID response header.
+    """
+    global _listener
+    config = app.config
+    _set_defaults(config)
+    handler = _output_handler(config)
+
+    # Filter on the queue side: it runs in the request thread, where g is available
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, logging.handlers.QueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(config['LOG_LEVEL'])
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # Drain what's queued on shutdown
+
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
@@ -0,0 +1,193 @@
+import os
+import json
+import glob
+import time
+import threading
+import logging
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests by endpoint, method and status code.', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint.', LATENCY_BUCKETS),
+    'db_queries_per_request': ('histogram', 'SQL statements executed per request.', QUERY_COUNT_BUCKETS),
+    'db_queries_total': ('counter', 'SQL statements executed, by endpoint.', None),
+    'db_query_duration_seconds_total': ('counter', 'Time spent in SQL statements, by endpoint.', None),
+    'infobip_request_duration_seconds': ('histogram', 'Infobip API call latency by channel.', LATENCY_BUCKETS),
+    'infobip_requests_total': ('counter', 'Infobip API calls by channel and HTTP status (or "error").', None),
+}
+
+
+class Registry:
+    """
+    This worker's metric values. Each worker writes a snapshot to METRICS_DIR/<pid>.json
+    (at most once per METRICS_FLUSH_INTERVAL); /metrics sums every file, so the figures
+    cover all gunicorn workers, including ones that have since been recycled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}  # (name, labels tuple) -> float, or [bucket counts..., sum, count]
+        self._dir = None
+        self._flush_interval = 1.0
+        self._last_flush = 0.0
+
+    def configure(self, directory, flush_interval):
+        self._dir = directory
+        self._flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if self._dir is None or (not force and now - self._last_flush < self._flush_interval):
+            return
+        self._last_flush = now
+        with self._lock:
+            snapshot = [[name, list(labels), value] for (name, labels), value in self._values.items()]
+        path = os.path.join(self._dir, f"{os.getpid()}.json")
+        try:
+            with open(path + '.tmp', 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logging.error(f"Metrics flush failed: {e}")
+
+    def collect(self):
+        """Values summed over every worker's snapshot file."""
+        self.flush(force=True)
+        totals = {}
+        for path in glob.glob(os.path.join(self._dir, '*.json')):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Being replaced right now; next scrape picks it up
+            for name, labels, value in snapshot:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                if isinstance(value, list):
+                    current = totals.setdefault(key, [0] * len(value))
+                    totals[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+registry = Registry()
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    totals = registry.collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(totals.items()):
+            if metric != name:
+                continue
+            if kind == 'histogram':
+                for bound, count in zip(buckets, value):
+                    lines.append(f"{name}_bucket{_label_text(labels, [('le', bound)])} {count}")
+                lines.append(f"{name}_bucket{_label_text(labels, [('le', '+Inf')])} {value[-1]}")
+                lines.append(f"{name}_sum{_label_text(labels)} {value[-2]}")
+                lines.append(f"{name}_count{_label_text(labels)} {value[-1]}")
+            else:
+                lines.append(f"{name}{_label_text(labels)} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def observe_infobip(channel, seconds, outcome):
+    registry.observe('infobip_request_duration_seconds', {'channel': channel}, seconds)
+    registry.inc('infobip_requests_total', {'channel': channel, 'outcome': outcome})
+
+
+# --- Request and SQL instrumentation ---
+def _record_request(status_code):
+    if getattr(g, 'metrics_recorded', True):  # Already recorded, or started before instrumentation
+        return
+    g.metrics_recorded = True
+    endpoint = request.endpoint or 'unmatched'
+    registry.inc('http_requests_total', {'endpoint': endpoint, 'method': request.method, 'status': str(status_code)})
+    registry.observe('http_request_duration_seconds', {'endpoint': endpoint, 'method': request.method},
+                     time.perf_counter() - g.metrics_start)
+    registry.observe('db_queries_per_request', {'endpoint': endpoint}, g.metrics_queries)
+    registry.inc('db_queries_total', {'endpoint': endpoint}, g.metrics_queries)
+    registry.inc('db_query_duration_seconds_total', {'endpoint': endpoint}, g.metrics_query_time)
+    registry.flush()
+
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_query_time = 0.0
+    g.metrics_recorded = False
+
+
+def _after_request(response):
+    # Streamed bodies (SSE, exports) are timed to the first byte, not to the end of the stream
+    _record_request(response.status_code)
+    return response
+
+
+def _teardown_request(exc):
+    if exc is not None:
+        _record_request(500)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['metrics_query_start'] = time.perf_counter()  # A connection runs one statement at a time
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_queries += 1
+        g.metrics_query_time += time.perf_counter() - conn.info['metrics_query_start']
+
+
+def init_app(app):
+    """
+    Request, SQL and Infobip metrics. Settings: METRICS_DIR (per-worker snapshot files,
+    default instance/metrics; clear it when the server starts), METRICS_FLUSH_INTERVAL (1 s).
+    """
+    app.config.setdefault('METRICS_DIR', os.path.join(app.instance_path, 'metrics'))
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', 1.0)
+    registry.configure(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'])
+
+    # First before_request hook, so redirects from later hooks are timed too
+    app.before_request_funcs.setdefault(None, []).insert(0, _before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
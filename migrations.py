@@ -0,0 +1,225 @@
+import time
+import logging
+import click
+from datetime import datetime
+from flask.cli import AppGroup
+from sqlalchemy import text, inspect
+from models import db
+
+# Versioned schema changes. db.create_all() creates missing tables with the current
+# models; everything that changes an existing table goes here, in order. Migrations
+# must be safe to re-run (a crash mid-way re-applies the whole step), which the
+# helpers below are: columns/indexes are skipped when present, backfills only touch
+# rows still needing it.
+
+MIGRATIONS = []  # (version, name, fn)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PAUSE = 0.05  # Seconds between batches, so live requests get the write lock
+
+
+def migration(version, name):
+    def decorator(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+class Migrator:
+    """Helpers handed to each migration."""
+
+    def __init__(self, engine, batch_size=DEFAULT_BATCH_SIZE, pause=DEFAULT_PAUSE):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def execute(self, sql, **params):
+        with self.engine.begin() as conn:
+            return conn.execute(text(sql), params)
+
+    def has_column(self, table, column):
+        return column in {c['name'] for c in inspect(self.engine).get_columns(table)}
+
+    def add_column(self, table, column, sql_type):
+        """ALTER TABLE ADD COLUMN (nullable, no default: a metadata-only change, no table rewrite)."""
+        if self.has_column(table, column):
+            return False
+        logging.info(f"Migration: adding column {table}.{column}")
+        self.execute(f'ALTER TABLE {table} ADD COLUMN {column} {sql_type}')
+        return True
+
+    def drop_column(self, table, column):
+        """ALTER TABLE DROP COLUMN if present (drop its indexes first). SQLite rewrites the table for this."""
+        if not self.has_column(table, column):
+            return False
+        logging.info(f"Migration: dropping column {table}.{column}")
+        self.execute(f'ALTER TABLE {table} DROP COLUMN {column}')
+        return True
+
+    def create_index(self, name, table, columns):
+        """
+        Creates the index if missing. PostgreSQL builds it CONCURRENTLY (no write lock);
+        SQLite has no online build, so the lock is held for the build (keep these small).
+        """
+        columns = ', '.join([columns] if isinstance(columns, str) else columns)
+        if self.engine.dialect.name == 'postgresql':
+            with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})'))
+        else:
+            self.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+    def drop_index(self, name):
+        if self.engine.dialect.name == 'postgresql':
+            with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
+        else:
+            self.execute(f'DROP INDEX IF EXISTS {name}')
+
+    def backfill(self, table, assignments, where, **params):
+        """
+        UPDATE table SET <assignments> WHERE <where>, one batch_size window of ids per
+        transaction with a pause in between, so no single statement holds the write lock
+        for long. Each window is visited once, so this ends even if `where` still matches
+        a row after its update. Returns the number of rows updated.
+        """
+        total = 0
+
+        def update(first, last):
+            nonlocal total
+            result = self.execute(
+                f'UPDATE {table} SET {assignments} WHERE id BETWEEN :first AND :last AND ({where})',
+                first=first, last=last, **params
+            )
+            if result.rowcount > 0:
+                total += result.rowcount
+                logging.info(f"Migration: backfilled {total} rows of {table}")
+        self.for_id_ranges(table, update)
+        return total
+
+    def for_id_ranges(self, table, fn):
+        """Calls fn(first_id, last_id) over the table's id space in batch_size windows (pausing in between)."""
+        with self.engine.connect() as conn:
+            low, high = conn.execute(text(f'SELECT MIN(id), MAX(id) FROM {table}')).one()
+        if low is None:
+            return
+        for first in range(low, high + 1, self.batch_size):
+            fn(first, min(first + self.batch_size - 1, high))
+            time.sleep(self.pause)
+
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_migrations ('
+            'version INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, applied_at DATETIME NOT NULL)'
+        ))
+
+
+def applied_versions(engine):
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text('SELECT version FROM schema_migrations'))}
+
+
+def pending():
+    applied = applied_versions(db.engine)
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def upgrade(target=None, batch_size=DEFAULT_BATCH_SIZE, pause=DEFAULT_PAUSE):
+    """Creates missing tables, then applies pending migrations (up to `target`) in order. Returns the versions run."""
+    db.create_all()
+    migrator = Migrator(db.engine, batch_size, pause)
+    done = []
+    for version, name, fn in pending():
+        if target is not None and version > target:
+            break
+        logging.info(f"Migration {version}: {name}")
+        started = time.perf_counter()
+        fn(migrator)
+        with db.engine.begin() as conn:
+            conn.execute(text('INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)'),
+                         {'v': version, 'n': name, 't': datetime.utcnow()})
+        logging.info(f"Migration {version} done in {time.perf_counter() - started:.1f}s")
+        done.append(version)
+    return done
+
+
+# --- Migrations ---
+@migration(1, 'Columns added to early schemas (brand, technician notes, public/private notes)')
+def _legacy_columns(m):
+    m.add_column('device', 'brand', 'VARCHAR(100)')
+    m.add_column('device', 'technician_notes', 'TEXT')
+    if m.add_column('timeline_log', 'public_note', 'TEXT'):
+        m.backfill('timeline_log', 'public_note = note', 'public_note IS NULL AND note IS NOT NULL')
+    m.add_column('timeline_log', 'private_note', 'TEXT')
+
+
+@migration(2, 'Device last log fingerprint (duplicate update check)')
+def _last_log(m):
+    m.add_column('device', 'last_log_fingerprint', 'VARCHAR(40)')
+    m.add_column('device', 'last_log_at', 'DATETIME')
+
+
+@migration(3, 'updated_at on devices and customers (delta sync)')
+def _updated_at(m):
+    m.add_column('device', 'updated_at', 'DATETIME')
+    m.backfill('device', 'updated_at = COALESCE(last_log_at, created_at, CURRENT_TIMESTAMP)', 'updated_at IS NULL')
+    m.add_column('customer', 'updated_at', 'DATETIME')
+    m.backfill('customer', 'updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)', 'updated_at IS NULL')
+    m.create_index('ix_device_updated_at', 'device', 'updated_at')
+    m.create_index('ix_customer_updated_at', 'customer', 'updated_at')
+
+
+@migration(4, 'Device list projection')
+def _device_listing(m):
+    from listing import refresh_listings
+    from models import Device
+
+    m.create_index('ix_device_customer_id', 'device', 'customer_id')  # Listing refresh on customer edits
+    with m.engine.connect() as conn:
+        devices, listed = conn.execute(text(
+            'SELECT (SELECT COUNT(*) FROM device), (SELECT COUNT(*) FROM device_listing)')).one()
+    if devices == listed:
+        return  # Already built (databases that had the projection before migrations)
+
+    def fill(first, last):
+        refresh_listings(db.session, Device.id.between(first, last))
+        db.session.commit()
+    m.for_id_ranges('device', fill)
+
+
+@migration(5, 'Indexes for per-device timeline and notification reads')
+def _child_indexes(m):
+    m.create_index('ix_timeline_log_device_id', 'timeline_log', 'device_id')
+    m.create_index('ix_notification_log_device_id', 'notification_log', 'device_id')
+
+
+@migration(6, 'Drop updated_at (delta sync reads device_listing.listed_at since version 4)')
+def _drop_updated_at(m):
+    for table in ('device', 'customer'):
+        m.drop_index(f'ix_{table}_updated_at')
+        m.drop_column(table, 'updated_at')
+
+
+# --- CLI: flask db upgrade / flask db status ---
+db_cli = AppGroup('db', help='Schema migrations.')
+
+
+@db_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Stop after this version.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, help='Rows per backfill transaction.')
+@click.option('--pause', default=DEFAULT_PAUSE, show_default=True, help='Seconds to wait between batches.')
+def upgrade_command(target, batch_size, pause):
+    """Apply pending migrations."""
+    done = upgrade(target, batch_size, pause)
+    click.echo(f"Applied: {', '.join(map(str, done))}" if done else "Up to date")
+
+
+@db_cli.command('status')
+def status_command():
+    """List migrations and whether they are applied."""
+    applied = applied_versions(db.engine)
+    for version, name, _ in MIGRATIONS:
+        click.echo(f"{'[x]' if version in applied else '[ ]'} {version:3d}  {name}")
@@ -1,9 +1,18 @@
+import hashlib
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
 
 db = SQLAlchemy()
 
+# Repair lifecycle (Greek), in workflow order
+DEVICE_STATUSES = ('Παραλήφθηκε', 'Υπό Έλεγχο', 'Υπό Επισκευή', 'Έτοιμο', 'Αρχείο')
+
+def log_fingerprint(status, public_note, private_note):
+    """Hash of the fields the anti-spam check compares (status + public/private note)."""
+    raw = '\x1f'.join((status or '', public_note or '', private_note or ''))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(100), unique=True, nullable=False)
@@ -26,7 +35,7 @@ class Device(db.Model):
     tracking_id = db.Column(db.String(20), unique=True, nullable=False)
     
     # Customer Relationship
-    customer_id = db.Column(db.Integer, db.ForeignKey('customer.id'), nullable=False)
+    customer_id = db.Column(db.Integer, db.ForeignKey('customer.id'), nullable=False, index=True)
     
     model = db.Column(db.String(100), nullable=False)
     brand = db.Column(db.String(100), nullable=True) # Added Brand
@@ -46,9 +55,20 @@ class Device(db.Model):
     
     logs = db.relationship('TimelineLog', backref='device', lazy=True, cascade="all, delete-orphan")
 
+    # Latest TimelineLog, denormalized so duplicate checks don't read the logs (see record_log)
+    last_log_fingerprint = db.Column(db.String(40), nullable=True)
+    last_log_at = db.Column(db.DateTime, nullable=True)
+
+    def record_log(self, log):
+        """Point the device at its newest log. Call whenever a TimelineLog is added."""
+        if log.timestamp is None:
+            log.timestamp = datetime.utcnow()
+        self.last_log_fingerprint = log_fingerprint(log.status, log.public_note, log.private_note)
+        self.last_log_at = log.timestamp
+
 class TimelineLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    device_id = db.Column(db.Integer, db.ForeignKey('device.id'), nullable=False)
+    device_id = db.Column(db.Integer, db.ForeignKey('device.id'), nullable=False, index=True)
     status = db.Column(db.String(50), nullable=False)
     note = db.Column(db.Text, nullable=True) # Keeping for backward compatibility or general logging
     public_note = db.Column(db.Text, nullable=True) # Added Public Note
@@ -87,10 +107,50 @@ class SystemSetting(db.Model):
 
 class NotificationLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    device_id = db.Column(db.Integer, db.ForeignKey('device.id'), nullable=False)
+    device_id = db.Column(db.Integer, db.ForeignKey('device.id'), nullable=False, index=True)
     channel = db.Column(db.String(20), nullable=False) # SMS, WHATSAPP
     status = db.Column(db.String(20), nullable=False) # SENT, FAILED
     message_content = db.Column(db.Text, nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     
     device_rel = db.relationship('Device', backref='notifications')
+
+class TrackingSequence(db.Model):
+    # Counter behind tracking_ids.allocate_tracking_ids (one row per sequence)
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+
+class ChangeEvent(db.Model):
+    # Append-only feed of device changes, written in the same transaction as the change.
+    # Read by changefeed.py to push live updates to every worker's open streams.
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False) # device_created, status_changed, notes_updated, bulk_import
+    device_id = db.Column(db.Integer, nullable=True, index=True)
+    payload = db.Column(db.Text, nullable=False) # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class DeviceListing(db.Model):
+    # Read model for the dashboard list: one row per device with the card fields already
+    # joined in. Maintained on write by listing.py, never edited directly.
+    __tablename__ = 'device_listing'
+    device_id = db.Column(db.Integer, db.ForeignKey('device.id', ondelete='CASCADE'), primary_key=True)
+    tracking_id = db.Column(db.String(20), nullable=False)
+    customer_name = db.Column(db.String(100), nullable=False)
+    phone = db.Column(db.String(20), nullable=False)
+    brand = db.Column(db.String(100), nullable=True)
+    model = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(50), nullable=False)
+    is_archived = db.Column(db.Boolean, nullable=False, default=False)
+    technician_id = db.Column(db.Integer, nullable=True)
+    technician = db.Column(db.String(100), nullable=True)
+    created_by_id = db.Column(db.Integer, nullable=True)
+    created_by = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+    listed_at = db.Column(db.DateTime, nullable=False, index=True) # Last refresh (delta sync cursor)
+
+    __table_args__ = (
+        db.Index('ix_device_listing_status', 'is_archived', 'status', 'created_at'),
+        db.Index('ix_device_listing_technician', 'technician_id', 'created_at'),
+        db.Index('ix_device_listing_created_by', 'created_by_id', 'created_at'),
+    )
@@ -0,0 +1,77 @@
+import queue
+import atexit
+import logging
+import threading
+from sqlalchemy.orm import joinedload
+from models import db, Device
+from infobip_service import InfobipService
+
+MAX_PENDING = 1000  # Batches waiting to be sent; beyond this new ones are dropped (and logged)
+DRAIN_TIMEOUT = 30  # Seconds given to queued batches on shutdown
+
+
+class NotificationDispatcher:
+    """
+    Sends customer notifications off the request path. Views enqueue (device ids, trigger)
+    after their commit and return; one background thread per process reloads the devices
+    and hands them to InfobipService.send_batch, so a slow or unreachable Infobip never
+    holds a request (or a worker thread) open.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._queue = queue.Queue(maxsize=MAX_PENDING)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def init_app(self, app):
+        self._app = app
+        atexit.register(self.drain)
+
+    def enqueue(self, device_ids, trigger):
+        """Queues one batch. Only ids cross threads: the worker loads the rows in its own session."""
+        try:
+            self._queue.put_nowait((list(device_ids), trigger))
+        except queue.Full:
+            logging.error(f"Notification queue full, dropped '{trigger}' for devices {sorted(device_ids)}")
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='notifications', daemon=True)
+                self._thread.start()
+
+    def drain(self, timeout=DRAIN_TIMEOUT):
+        """Waits (up to timeout) for queued batches to be sent, e.g. on worker shutdown."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def _run(self):
+        with self._app.app_context():
+            while True:
+                try:
+                    device_ids, trigger = self._queue.get(timeout=1)
+                except queue.Empty:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+                try:
+                    self._send(device_ids, trigger)
+                except Exception as e:
+                    logging.error(f"Notification System Error: {e}")
+                finally:
+                    db.session.remove()
+
+    def _send(self, device_ids, trigger):
+        # Load the devices with their customers in one query
+        devices = Device.query.options(joinedload(Device.customer)).filter(Device.id.in_(device_ids)).all()
+        InfobipService.send_batch(devices, trigger)
+
+
+dispatcher = NotificationDispatcher()
+
+
+def init_app(app):
+    dispatcher.init_app(app)
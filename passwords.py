@@ -0,0 +1,77 @@
+import os
+import threading
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'  # Werkzeug's default, written out so it can be tuned
+
+
+def method_prefix(method):
+    """
+    The method part stored hashes start with, with Werkzeug's defaults filled in
+    ('pbkdf2:sha256' -> 'pbkdf2:sha256:1000000'). Parsed rather than hashed: computing a
+    hash just to read its prefix would cost a full scrypt on every worker start.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and len(args) in (0, 3):
+        n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2' and len(args) <= 2:
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Invalid PASSWORD_HASH_METHOD '{method}'")
+
+
+def _offload(fn, *args):
+    """
+    Runs a hash computation without starving the worker. At most PASSWORD_HASH_CONCURRENCY
+    run at once per worker (a login storm queues instead of taking every thread), and under
+    gevent the work goes to the hub's native threadpool so other greenlets keep being served.
+    """
+    with current_app.extensions['passwords']['semaphore']:
+        threadpool = _gevent_threadpool()
+        if threadpool is not None:
+            return threadpool.apply(fn, args)
+        return fn(*args)
+
+
+def _gevent_threadpool():
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return None
+    if not monkey.is_module_patched('threading'):
+        return None
+    return get_hub().threadpool
+
+
+def hash_password(password):
+    config = current_app.config
+    return _offload(generate_password_hash, password, config['PASSWORD_HASH_METHOD'],
+                    config['PASSWORD_SALT_LENGTH'])
+
+
+def verify_password(stored_hash, password):
+    return _offload(check_password_hash, stored_hash, password)
+
+
+def needs_rehash(stored_hash):
+    """True when the stored hash was made with other parameters than the configured ones."""
+    return stored_hash.split('$', 1)[0] != current_app.extensions['passwords']['prefix']
+
+
+def init_app(app):
+    """
+    Settings: PASSWORD_HASH_METHOD (Werkzeug method string, e.g. 'scrypt:32768:8:1' or
+    'pbkdf2:sha256:600000'), PASSWORD_SALT_LENGTH (16), PASSWORD_HASH_CONCURRENCY
+    (hashes computed at once per worker, default CPU count).
+    """
+    app.config.setdefault('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    app.config.setdefault('PASSWORD_SALT_LENGTH', 16)
+    app.config.setdefault('PASSWORD_HASH_CONCURRENCY', os.cpu_count() or 2)
+
+    app.extensions['passwords'] = {
+        'prefix': method_prefix(app.config['PASSWORD_HASH_METHOD']),
+        'semaphore': threading.BoundedSemaphore(app.config['PASSWORD_HASH_CONCURRENCY']),
+    }
@@ -0,0 +1,104 @@
+import re
+import logging
+from collections import Counter
+from flask import g, request, current_app, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+N_PLUS_ONE_THRESHOLD = 3  # Same SELECT shape this many times in one request = N+1
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\(\s*(?:\?|%\([^)]*\)s|:\w+)(?:\s*,\s*(?:\?|%\([^)]*\)s|:\w+))*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries):
+    """
+    Declares the most SQL statements one request to this view may run. Put it directly
+    above the view function (below @app.route / @login_required), e.g.
+
+        @app.route('/track')
+        @query_budget(3)
+        def track_device(): ...
+
+    Only checked when QUERY_BUDGET_MODE is 'warn' or 'raise'.
+    """
+    def decorator(fn):
+        fn.query_budget = max_queries
+        return fn
+    return decorator
+
+
+def batched(fn):
+    """
+    Marks a view that works through its input in batches (e.g. the CSV import): the same
+    reads repeat once per batch by design, so they aren't reported as N+1.
+    """
+    fn.query_batched = True
+    return fn
+
+
+def statement_shape(statement):
+    """SQL with literals and IN-list lengths folded, so the same query with other values compares equal."""
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _LITERAL.sub('?', shape)
+    return _IN_LIST.sub('(?)', shape)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_shapes' in g:
+        g.query_shapes[statement_shape(statement)] += 1
+
+
+def _mode():
+    mode = current_app.config.get('QUERY_BUDGET_MODE')
+    if mode is None:  # Not set: follow the app (TESTING may be switched on after import)
+        mode = 'raise' if current_app.testing else 'warn' if current_app.debug else 'off'
+    return mode
+
+
+def _before_request():
+    if _mode() != 'off':
+        g.query_shapes = Counter()
+
+
+def _check_request(response):
+    shapes = g.pop('query_shapes', None)
+    if shapes is None:
+        return response
+    total = sum(shapes.values())
+    response.headers['X-Query-Count'] = str(total)
+
+    problems = []
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, 'query_budget', None)
+    if budget is not None and total > budget:
+        problems.append(f"{total} queries, budget is {budget}")
+    for shape, count in ([] if getattr(view, 'query_batched', False) else shapes.items()):
+        # Only reads: repeated INSERT/UPDATEs are the ORM writing a batch within one flush
+        if count >= N_PLUS_ONE_THRESHOLD and shape.upper().startswith(('SELECT', 'WITH')):
+            problems.append(f"possible N+1, {count}x: {shape[:200]}")
+    if not problems:
+        return response
+
+    message = f"Query budget: {request.method} {request.path} ({request.endpoint}): " + '; '.join(problems)
+    if _mode() == 'raise':
+        raise QueryBudgetExceeded(message)
+    logging.warning(message)
+    return response
+
+
+def init_app(app):
+    """
+    QUERY_BUDGET_MODE: 'off', 'warn' (log violations) or 'raise' (fail the request).
+    Unset means 'raise' when TESTING, 'warn' in debug mode, otherwise 'off'.
+    Active modes also send an X-Query-Count header.
+    """
+    app.before_request(_before_request)
+    app.after_request(_check_request)
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
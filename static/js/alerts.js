@@ -0,0 +1,41 @@
+// Message dialogs on a Bootstrap modal: showAlert(title, text, icon), icon = success | error | warning | info
+const ALERT_ICONS = {
+    success: ['fa-circle-check', 'text-success'],
+    error: ['fa-circle-xmark', 'text-danger'],
+    warning: ['fa-triangle-exclamation', 'text-warning'],
+    info: ['fa-circle-info', 'text-info'],
+};
+
+function showAlert(title, text, icon = 'info') {
+    let el = document.getElementById('alertModal');
+    if (!el) {
+        el = document.createElement('div');
+        el.id = 'alertModal';
+        el.className = 'modal fade';
+        el.tabIndex = -1;
+        el.style.zIndex = 1075; // Above other open modals (e.g. the form that just submitted)
+        el.innerHTML = `
+            <div class="modal-dialog modal-dialog-centered modal-sm">
+                <div class="modal-content border-0 shadow text-center">
+                    <div class="modal-body pt-4">
+                        <i class="fas fa-3x mb-3" data-alert-icon></i>
+                        <h5 class="fw-bold mb-2" data-alert-title></h5>
+                        <p class="text-muted mb-0" data-alert-text></p>
+                    </div>
+                    <div class="modal-footer border-0 justify-content-center pb-4">
+                        <button type="button" class="btn btn-primary px-4" data-bs-dismiss="modal">OK</button>
+                    </div>
+                </div>
+            </div>`;
+        el.addEventListener('shown.bs.modal', () => el.querySelector('[data-bs-dismiss]').focus());
+        document.body.appendChild(el);
+    }
+    const [iconClass, color] = ALERT_ICONS[icon] || ALERT_ICONS.info;
+    el.querySelector('[data-alert-icon]').className = `fas fa-3x mb-3 ${iconClass} ${color}`;
+    el.querySelector('[data-alert-title]').textContent = title;
+    el.querySelector('[data-alert-text]').textContent = text;
+    bootstrap.Modal.getOrCreateInstance(el).show();
+    // show() has just added our backdrop: keep it between the alert and any modal under it
+    const backdrops = document.querySelectorAll('.modal-backdrop');
+    if (backdrops.length) backdrops[backdrops.length - 1].style.zIndex = 1070;
+}
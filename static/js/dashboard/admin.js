@@ -0,0 +1,222 @@
+// Admin views (staff, Infobip settings). Loaded on demand by core.js: loadAdminModule()
+
+async function loadStaff() {
+    const container = document.getElementById('mainContent');
+    container.innerHTML = '<div class="d-flex justify-content-between align-items-center mb-3"><h4 class="text-secondary">Προσωπικό</h4><button class="btn btn-primary btn-sm" data-bs-toggle="modal" data-bs-target="#staffModal"><i class="fas fa-plus"></i> Νέο μέλος</button></div>';
+
+    try {
+        const res = await fetch('/api/staff');
+        const data = await res.json();
+
+        let html = '<div class="table-responsive"><table class="table table-hover align-middle shadow-sm bg-white rounded"><thead><tr><th>User</th><th>Role</th><th>Last Login</th><th class="text-end">Action</th></tr></thead><tbody>';
+        data.forEach(u => {
+            html += `<tr class="cursor-pointer" onclick="filterByStaff(${u.id}, '${u.username}')">
+                <td>${u.username} ${u.role !== 'admin' ? '<i class="fas fa-filter text-muted ms-2 small"></i>' : ''}</td>
+                <td><span class="badge bg-secondary">${u.role}</span></td>
+                <td>${u.last_login}</td>
+                <td class="text-end" onclick="event.stopPropagation()">
+                    ${u.username !== 'admin' ? `<button onclick="deleteStaff(${u.id})" class="btn btn-sm btn-outline-danger"><i class="fas fa-trash"></i></button>` : '-'}
+                </td>
+            </tr>`;
+        });
+        html += '</tbody></table></div>';
+        container.insertAdjacentHTML('beforeend', html);
+    } catch (e) { container.innerHTML += '<div class="alert alert-danger">Σφάλμα φόρτωσης προσωπικού</div>'; }
+}
+
+async function loadSettings() {
+    const container = document.getElementById('mainContent');
+    container.innerHTML = '<div class="text-center"><div class="spinner-border"></div></div>';
+    try {
+        const res = await fetch('/api/settings');
+        const data = await res.json();
+        if (data.error) { container.innerHTML = '<div class="alert alert-danger">Μη εξουσιοδοτημένη πρόσβαση</div>'; return; }
+
+        const isActive = (val) => (data.active_channel === val ? 'checked' : '');
+
+        let html = `
+        <div class="card border-0 shadow-sm mx-auto" style="max-width: 800px;">
+            <div class="card-header bg-white border-bottom d-flex justify-content-between align-items-center">
+                <h5 class="mb-0 text-primary">Ρυθμίσεις Infobip</h5>
+                <span class="badge bg-light text-dark border">
+                    <i class="fas fa-satellite-dish me-1"></i> Ενεργό: <strong class="text-uppercase text-primary">${data.active_channel}</strong>
+                </span>
+            </div>
+            <div class="card-body">
+                <form onsubmit="saveSettings(event)">
+                     <!-- Enable Channel Switch -->
+                     <div class="mb-4 p-3 bg-light rounded border">
+                        <label class="form-label fw-bold d-block mb-3">Επιλογή Ενεργού Καναλιού Ενημέρωσης («Έτοιμο»)</label>
+                        <div class="btn-group w-100" role="group">
+                            <input type="radio" class="btn-check" name="active_channel" id="ac_sms" value="sms" ${isActive('sms')}>
+                            <label class="btn btn-outline-primary" for="ac_sms"><i class="fas fa-sms me-2"></i>SMS</label>
+
+                            <input type="radio" class="btn-check" name="active_channel" id="ac_wa" value="whatsapp" ${isActive('whatsapp')}>
+                            <label class="btn btn-outline-success" for="ac_wa"><i class="fab fa-whatsapp me-2"></i>WhatsApp</label>
+
+                            <input type="radio" class="btn-check" name="active_channel" id="ac_vb" value="viber" ${isActive('viber')}>
+                            <label class="btn btn-outline-secondary" for="ac_vb" style="border-color: #665CAC; color: #665CAC;"><i class="fab fa-viber me-2"></i>Viber</label>
+                        </div>
+                     </div>
+
+                     <!-- Tabs Navigation -->
+                     <ul class="nav nav-tabs mb-3" id="settingsTabs" role="tablist">
+                        <li class="nav-item" role="presentation">
+                            <button class="nav-link active" id="sms-tab" data-bs-toggle="tab" data-bs-target="#sms-pane" type="button" role="tab"><i class="fas fa-sms me-2"></i>SMS</button>
+                        </li>
+                        <li class="nav-item" role="presentation">
+                            <button class="nav-link text-success" id="whatsapp-tab" data-bs-toggle="tab" data-bs-target="#whatsapp-pane" type="button" role="tab"><i class="fab fa-whatsapp me-2"></i>WhatsApp</button>
+                        </li>
+                        <li class="nav-item" role="presentation">
+                            <button class="nav-link" id="viber-tab" data-bs-toggle="tab" data-bs-target="#viber-pane" type="button" role="tab" style="color: #665CAC;"><i class="fab fa-viber me-2"></i>Viber</button>
+                        </li>
+                     </ul>
+
+                     <!-- Tabs Content -->
+                     <div class="tab-content mb-4" id="settingsTabsContent">
+                        <!-- SMS TAB -->
+                        <div class="tab-pane fade show active" id="sms-pane" role="tabpanel">
+                             <div class="row g-2 mb-3">
+                                 <div class="col-md-12"><label class="small text-muted">API Key</label><div class="input-group"><input type="password" name="api_key_sms" value="${data.api_key_sms || ''}" class="form-control" autocomplete="off"><button type="button" class="btn btn-outline-secondary" onclick="togglePassword(this)"><i class="fas fa-eye"></i></button></div></div>
+                                 <div class="col-md-6"><label class="small text-muted">Base URL</label><input type="text" name="base_url_sms" value="${data.base_url_sms || ''}" class="form-control"></div>
+                                 <div class="col-md-6"><label class="small text-muted">Sender ID (Όνομα Αποστολέα)</label><input type="text" name="sender_id_sms" value="${data.sender_id_sms || ''}" class="form-control"></div>
+                             </div>
+                        </div>
+
+                        <!-- WhatsApp TAB -->
+                        <div class="tab-pane fade" id="whatsapp-pane" role="tabpanel">
+                             <div class="alert alert-soft-success small mb-3"><i class="fas fa-info-circle me-1"></i> Ο αριθμός WhatsApp πρέπει να είναι εγκεκριμένος στο Infobip.</div>
+                             <div class="row g-2 mb-3">
+                                 <div class="col-md-12"><label class="small text-muted">API Key</label><div class="input-group"><input type="password" name="api_key_wa" value="${data.api_key_wa || ''}" class="form-control" autocomplete="off"><button type="button" class="btn btn-outline-secondary" onclick="togglePassword(this)"><i class="fas fa-eye"></i></button></div></div>
+                                 <div class="col-md-6"><label class="small text-muted">Base URL</label><input type="text" name="base_url_wa" value="${data.base_url_wa || ''}" class="form-control"></div>
+                                 <div class="col-md-6"><label class="small text-muted">Sender Number (Αριθμός)</label><input type="text" name="number_wa" value="${data.number_wa || ''}" class="form-control"></div>
+                             </div>
+                        </div>
+
+                        <!-- Viber TAB -->
+                        <div class="tab-pane fade" id="viber-pane" role="tabpanel">
+                             <div class="row g-2 mb-3">
+                                 <div class="col-md-12"><label class="small text-muted">API Key</label><div class="input-group"><input type="password" name="api_key_viber" value="${data.api_key_viber || ''}" class="form-control" autocomplete="off"><button type="button" class="btn btn-outline-secondary" onclick="togglePassword(this)"><i class="fas fa-eye"></i></button></div></div>
+                                 <div class="col-md-6"><label class="small text-muted">Base URL</label><input type="text" name="base_url_viber" value="${data.base_url_viber || ''}" class="form-control"></div>
+                                 <div class="col-md-6"><label class="small text-muted">Sender Name (Όνομα)</label><input type="text" name="sender_viber" value="${data.sender_viber || ''}" class="form-control"></div>
+                             </div>
+                        </div>
+                     </div>
+
+                     <hr class="text-muted">
+                     <div class="mb-3">
+                         <label class="form-label text-secondary fw-bold">Πρότυπα Μηνυμάτων (Templates)</label>
+                         <div class="mb-2">
+                             <label class="small text-muted">Εγγραφή (Registration)</label>
+                             <textarea name="tpl_reg" class="form-control" rows="1">${data.template_reg || ''}</textarea>
+                         </div>
+                         <div class="mb-2">
+                             <label class="small text-muted text-success fw-bold">Έτοιμο (Ready) - Αυτόματη Αποστολή</label>
+                             <textarea name="tpl_rdy" class="form-control" rows="1">${data.template_ready || ''}</textarea>
+                         </div>
+                         <div class="mb-2">
+                             <label class="small text-muted">Παράδοση (Delivered)</label>
+                             <textarea name="tpl_del" class="form-control" rows="1">${data.template_del || ''}</textarea>
+                         </div>
+                     </div>
+                     <button type="submit" id="btnSaveSettings" class="btn btn-primary w-100">Αποθήκευση</button>
+                </form>
+            </div>
+        </div>`;
+        container.innerHTML = html;
+    } catch (e) { console.error(e); container.innerHTML = '<div class="alert alert-danger">Σφάλμα φόρτωσης.</div>'; }
+}
+
+function togglePassword(btn) {
+    const input = btn.previousElementSibling;
+    if (input.type === 'password') {
+        input.type = 'text';
+        btn.innerHTML = '<i class="fas fa-eye-slash"></i>';
+    } else {
+        input.type = 'password';
+        btn.innerHTML = '<i class="fas fa-eye"></i>';
+    }
+}
+
+async function saveSettings(e) {
+    e.preventDefault();
+    const btn = document.getElementById('btnSaveSettings');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Αποθήκευση...';
+    btn.disabled = true;
+
+    const fd = new FormData(e.target);
+
+    // ... (data collection) ...
+    const data = {
+        active_channel: fd.get('active_channel'),
+        api_key_sms: fd.get('api_key_sms'), base_url_sms: fd.get('base_url_sms'), sender_id_sms: fd.get('sender_id_sms'),
+        api_key_wa: fd.get('api_key_wa'), base_url_wa: fd.get('base_url_wa'), number_wa: fd.get('number_wa'),
+        api_key_viber: fd.get('api_key_viber'), base_url_viber: fd.get('base_url_viber'), sender_viber: fd.get('sender_viber'),
+        template_reg: fd.get('tpl_reg'), template_ready: fd.get('tpl_rdy'), template_del: fd.get('tpl_del')
+    };
+
+    try {
+        const res = await fetch('/api/settings', {
+            method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(data)
+        });
+        if (res.ok) {
+            showAlert('Αποθηκεύτηκε', 'Οι ρυθμίσεις ενημερώθηκαν επιτυχώς.', 'success');
+            loadSettings();
+        } else {
+            showAlert('Σφάλμα', 'Απέτυχε η αποθήκευση.', 'error');
+        }
+    } catch (err) {
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα.', 'error');
+    } finally {
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
+
+async function handleAddStaff(e) {
+    e.preventDefault();
+    const btn = e.target.querySelector('button[type="submit"]');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Προσθήκη...';
+    btn.disabled = true;
+
+    const fd = new FormData(e.target);
+
+    try {
+        const res = await fetch('/api/staff', { method: 'POST', body: fd });
+        const data = await res.json();
+
+        if (res.ok) {
+            if (staffModalBs) staffModalBs.hide();
+            e.target.reset();
+            showAlert('Επιτυχία', 'Ο χρήστης προστέθηκε.', 'success');
+            loadStaff();
+        } else {
+            showAlert('Σφάλμα', data.message || 'Απέτυχε η προσθήκη', 'error');
+        }
+    } catch (err) {
+        console.error(err);
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα', 'error');
+    } finally {
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
+
+async function deleteStaff(id) {
+    if (!confirm('Είστε σίγουροι για τη διαγραφή;')) return;
+
+    try {
+        const res = await fetch(`/api/staff/${id}`, { method: 'DELETE' });
+        const data = await res.json();
+
+        if (res.ok) {
+            loadStaff();
+        } else {
+            showAlert('Σφάλμα', data.message || 'Απέτυχε η διαγραφή', 'error');
+        }
+    } catch (err) {
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα', 'error');
+    }
+}
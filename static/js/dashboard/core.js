@@ -0,0 +1,687 @@
+let currentView = 'active';
+let currentStatusFilter = 'all';
+let currentUserFilter = null;
+let cachedData = [];
+let selectedIds = new Set(); // Bulk status selection (active view)
+
+// Bootstrap Modal instances
+let addDeviceModalBs, statusModalBs, staffModalBs, detailsModalBs;
+
+// Staff/settings code (admin.js) is only fetched when an admin first opens those views
+const ADMIN_SRC = document.currentScript.dataset.adminSrc;
+let adminModule = null;
+
+function loadAdminModule() {
+    if (!adminModule) {
+        adminModule = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = ADMIN_SRC;
+            script.onload = resolve;
+            script.onerror = () => { adminModule = null; reject(new Error('admin.js')); }; // Retry on the next click
+            document.head.appendChild(script);
+        });
+    }
+    return adminModule;
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    loadStats();
+    switchView('active');
+    connectLiveUpdates();
+
+    // Init Modals
+    if (document.getElementById('addDeviceModal')) addDeviceModalBs = new bootstrap.Modal(document.getElementById('addDeviceModal'));
+    if (document.getElementById('statusModal')) statusModalBs = new bootstrap.Modal(document.getElementById('statusModal'));
+    if (document.getElementById('staffModal')) staffModalBs = new bootstrap.Modal(document.getElementById('staffModal'));
+    if (document.getElementById('detailsModal')) detailsModalBs = new bootstrap.Modal(document.getElementById('detailsModal'));
+});
+
+// --- FILTERS ---
+function filterByStatus(status) {
+    currentStatusFilter = status;
+
+    // Visuals: Remove active border
+    document.querySelectorAll('[id^="card-"]').forEach(el => el.classList.remove('border-primary', 'border-2'));
+    if (document.getElementById(`card-${status}`)) {
+        document.getElementById(`card-${status}`).classList.add('border-primary', 'border-2');
+    }
+
+    if (status === 'archive') switchView('archive');
+    else {
+        if (currentView !== 'active') switchView('active');
+        else loadDevices();
+    }
+}
+
+function filterByStaff(userId, username) {
+    currentUserFilter = userId;
+    document.getElementById('filterStaffName').innerText = username;
+    document.getElementById('staffFilterIndicator').classList.remove('d-none');
+    loadStats();
+    switchView('active');
+}
+
+function clearStaffFilter() {
+    currentUserFilter = null;
+    document.getElementById('staffFilterIndicator').classList.add('d-none');
+    loadStats();
+    loadDevices();
+}
+
+// --- DATA LOADING ---
+async function loadStats() {
+    try {
+        let url = '/api/stats';
+        if (currentUserFilter) url += `?user_id=${currentUserFilter}`;
+        const res = await fetch(url);
+        const data = await res.json();
+        document.getElementById('stat-total').innerText = data.total;
+        document.getElementById('stat-received').innerText = data.received;
+        document.getElementById('stat-checking').innerText = data.checking;
+        document.getElementById('stat-repair').innerText = data.repair;
+        document.getElementById('stat-ready').innerText = data.ready;
+        document.getElementById('stat-completed').innerText = data.completed;
+    } catch (e) { console.error(e); }
+}
+
+async function switchView(view) {
+    currentView = view;
+
+    // Navbar Active State
+    document.querySelectorAll('.nav-link').forEach(el => el.classList.remove('active'));
+    if (document.getElementById('nav-' + view)) document.getElementById('nav-' + view).classList.add('active');
+
+    // Show/Hide Search
+    const searchRow = document.getElementById('controlsRow');
+    const statsRow = document.getElementById('statsRow');
+
+    if (view === 'staff' || view === 'settings') {
+        searchRow.classList.add('d-none');
+        if (view === 'settings') statsRow.classList.add('d-none');
+    } else {
+        searchRow.classList.remove('d-none');
+        statsRow.classList.remove('d-none');
+        document.getElementById('searchInput').value = '';
+    }
+
+    clearSelection();
+
+    if (view === 'staff' || view === 'settings') {
+        if (!ADMIN_SRC) return;
+        try { await loadAdminModule(); } catch (e) {
+            console.error(e);
+            document.getElementById('mainContent').innerHTML = '<div class="alert alert-danger">Σφάλμα φόρτωσης</div>';
+            return;
+        }
+        if (view === 'staff') loadStaff();
+        else loadSettings();
+    }
+    else loadDevices();
+}
+
+// Per-list cache ({ data, cursor } keyed by query string): revisiting a list only fetches changes
+const listCache = {};
+
+function deviceListParams() {
+    const params = new URLSearchParams();
+    if (currentView === 'archive') params.append('status', 'archive');
+    else if (currentStatusFilter !== 'all' && currentStatusFilter !== 'archive') params.append('status', currentStatusFilter);
+    else params.append('status', 'active');
+
+    if (currentUserFilter) params.append('user_id', currentUserFilter);
+    return params;
+}
+
+async function loadDevices() {
+    const params = deviceListParams();
+    const key = params.toString();
+    const cached = listCache[key];
+    if (cached) return syncDevices(key, cached);
+
+    const container = document.getElementById('mainContent');
+    container.innerHTML = '<div class="text-center text-muted mt-5"><div class="spinner-border text-primary" role="status"></div><div class="mt-2">Φόρτωση...</div></div>';
+
+    try {
+        const res = await fetch(`/api/devices?${key}`);
+        const data = await res.json();
+        listCache[key] = { data, cursor: res.headers.get('X-Sync-Cursor') };
+        cachedData = data;
+        renderDevices(data);
+    } catch (e) { console.error(e); container.innerHTML = '<div class="alert alert-danger">Σφάλμα φόρτωσης</div>'; }
+}
+
+// Merge only what changed since the list's cursor (tombstones drop out)
+async function syncDevices(key, cached) {
+    cachedData = cached.data;
+    filterList();
+    try {
+        const res = await fetch(`/api/devices/changes?${key}&since=${encodeURIComponent(cached.cursor)}`);
+        if (!res.ok) { delete listCache[key]; return loadDevices(); }
+        const delta = await res.json();
+
+        const removed = new Set(delta.removed);
+        const changed = new Map(delta.changed.map(d => [d.id, d]));
+        for (let i = cached.data.length - 1; i >= 0; i--) {
+            const d = cached.data[i];
+            if (removed.has(d.id)) cached.data.splice(i, 1);
+            else if (changed.has(d.id)) { cached.data[i] = changed.get(d.id); changed.delete(d.id); }
+        }
+        cached.data.unshift(...changed.values()); // New to this list
+        cached.cursor = delta.cursor;
+
+        if (cachedData === cached.data) filterList();
+    } catch (e) { console.error(e); }
+}
+
+// --- LIVE UPDATES (Server-Sent Events) ---
+let liveConnected = false;
+
+function connectLiveUpdates() {
+    if (!window.EventSource) return;
+    const es = new EventSource('/api/events/stream');
+    es.onopen = () => {
+        // After a reconnect, catch up on anything missed while disconnected
+        if (!liveConnected && isDeviceView() && cachedData.length) loadDevices();
+        liveConnected = true;
+    };
+    es.onerror = () => {
+        liveConnected = false; // EventSource reconnects by itself...
+        if (es.readyState === EventSource.CLOSED) setTimeout(connectLiveUpdates, 30000); // ...except after a 503 (server busy)
+    };
+
+    es.addEventListener('device_created', e => applyDeviceEvent(JSON.parse(e.data), true));
+    es.addEventListener('status_changed', e => applyDeviceEvent(JSON.parse(e.data), false));
+    es.addEventListener('bulk_import', () => { loadStats(); if (isDeviceView()) loadDevices(); });
+    es.addEventListener('resync', () => { loadStats(); if (isDeviceView()) loadDevices(); });
+}
+
+function isDeviceView() {
+    return currentView === 'active' || currentView === 'archive';
+}
+
+// Mirrors the server-side filters of /api/devices
+function matchesCurrentFilter(d) {
+    if (currentUserFilter && d.technician_id != currentUserFilter && d.created_by_id != currentUserFilter) return false;
+    if (currentView === 'archive') return d.is_archived;
+    if (d.is_archived) return false;
+    const statusByFilter = { received: 'Παραλήφθηκε', checking: 'Υπό Έλεγχο', repair: 'Υπό Επισκευή', ready: 'Έτοιμο' };
+    const wanted = statusByFilter[currentStatusFilter];
+    return !wanted || d.status === wanted;
+}
+
+function applyDeviceEvent(event, isNew) {
+    // Stats: apply the delta in place (per-user filtered stats need a recount)
+    if (currentUserFilter) loadStats();
+    else {
+        Object.entries(event.stats || {}).forEach(([key, delta]) => {
+            const el = document.getElementById(`stat-${key}`);
+            const value = parseInt(el.innerText, 10);
+            if (!isNaN(value)) el.innerText = value + delta;
+        });
+    }
+
+    if (!isDeviceView()) return;
+    const d = event.device;
+    const index = cachedData.findIndex(x => x.id === d.id);
+    if (matchesCurrentFilter(d)) {
+        if (index >= 0) cachedData[index] = d;
+        else if (isNew) cachedData.unshift(d);
+        else { loadDevices(); return; } // Moved into this view: keep server ordering
+    } else if (index >= 0) {
+        cachedData.splice(index, 1);
+    } else {
+        return;
+    }
+    filterList();
+}
+
+// --- DEVICE GRID (windowed) ---
+// Only the rows in or near the viewport exist in the DOM. Scrolling refills the same row/card
+// nodes with other devices, so scrolling and filtering cost the same at any list size.
+// Cards have a fixed height (.device-description in dashboard.css), so every row has the same pitch.
+const OVERSCAN_ROWS = 3;
+const grid = { container: null, items: [], columns: 0, rowHeight: 0, rows: new Map(), spare: [], frame: 0 };
+
+const STATUS_BADGES = {
+    'Παραλήφθηκε': ['bg-warning text-dark', ''],
+    'Υπό Έλεγχο': ['bg-info text-dark', ''],
+    'Υπό Επισκευή': ['text-white', 'background-color: #fd7e14;'],
+    'Έτοιμο': ['bg-success', ''],
+    'Αρχείο': ['bg-secondary', '']
+};
+
+const CARD_HTML = `
+    <div class="card device-card bg-white text-dark border-0 shadow-sm hover-shadow transition cursor-pointer">
+        <div class="card-body">
+            <div class="d-flex justify-content-between align-items-start mb-2">
+                <span>
+                    <input type="checkbox" class="form-check-input me-1" data-action="select">
+                    <span class="badge bg-light text-secondary border font-monospace" data-ref="tracking"></span>
+                </span>
+                <span class="badge" data-ref="status"></span>
+            </div>
+            <h5 class="card-title fw-bold text-truncate" data-ref="title"></h5>
+            <div class="card-text text-muted small mb-3">
+                <div class="text-truncate"><i class="fas fa-user me-2"></i><span data-ref="customer"></span></div>
+                <div class="text-truncate"><i class="fas fa-phone me-2"></i><span data-ref="phone"></span></div>
+            </div>
+            <p class="card-text small bg-light p-2 rounded text-secondary border device-description" data-ref="description"></p>
+            <div class="d-flex justify-content-between align-items-center mt-3 pt-2 border-top">
+                <small class="text-muted text-xs text-truncate" data-ref="created"></small>
+                <div class="text-nowrap" data-action="none">
+                    <button class="btn btn-sm btn-outline-secondary me-1" data-action="print" title="Print"><i class="fas fa-print"></i></button>
+                    <button class="btn btn-sm btn-outline-primary" data-action="status" title="Edit"><i class="fas fa-edit"></i></button>
+                </div>
+            </div>
+        </div>
+    </div>`;
+
+function gridColumns() {
+    if (window.matchMedia('(min-width: 992px)').matches) return 3; // col-lg-4
+    if (window.matchMedia('(min-width: 768px)').matches) return 2; // col-md-6
+    return 1;
+}
+
+function createRow() {
+    const row = document.createElement('div');
+    row.className = 'row g-3 position-absolute top-0 start-0 end-0';
+    for (let c = 0; c < grid.columns; c++) {
+        const slot = document.createElement('div');
+        slot.className = 'col-md-6 col-lg-4';
+        slot.innerHTML = CARD_HTML;
+        slot.refs = { select: slot.querySelector('[data-action="select"]'), edit: slot.querySelector('[data-action="status"]') };
+        slot.querySelectorAll('[data-ref]').forEach(el => { slot.refs[el.dataset.ref] = el; });
+        row.appendChild(slot);
+    }
+    grid.container.appendChild(row);
+    return row;
+}
+
+function fillCard(slot, d) {
+    const refs = slot.refs;
+    const [badgeClass, badgeStyle] = STATUS_BADGES[d.status] || ['bg-secondary', ''];
+    refs.tracking.textContent = d.tracking_id;
+    refs.status.className = `badge ${badgeClass}`;
+    refs.status.style.cssText = badgeStyle;
+    refs.status.textContent = d.status;
+    refs.title.textContent = `${d.brand ? d.brand + ' ' : ''}${d.model}`;
+    refs.customer.textContent = d.customer_name;
+    refs.phone.textContent = d.customer_phone || d.phone;
+    refs.description.textContent = d.description || 'Χωρίς περιγραφή';
+    refs.created.textContent = `${d.created_at} από ${d.created_by}`;
+    refs.select.hidden = refs.edit.hidden = currentView !== 'active';
+    refs.select.checked = selectedIds.has(d.id);
+}
+
+function fillRow(row, index) {
+    row.hidden = false;
+    row.style.transform = `translateY(${index * grid.rowHeight}px)`;
+    for (let c = 0; c < grid.columns; c++) {
+        const slot = row.children[c];
+        const itemIndex = index * grid.columns + c;
+        slot.hidden = itemIndex >= grid.items.length;
+        if (slot.hidden) continue;
+        slot.dataset.index = itemIndex;
+        fillCard(slot, grid.items[itemIndex]);
+    }
+}
+
+function layoutGrid(refill) {
+    const columns = gridColumns();
+    if (columns !== grid.columns || !grid.rowHeight) {
+        // First render or new breakpoint: rebuild rows with the new column count and re-measure
+        grid.columns = columns;
+        grid.container.replaceChildren();
+        grid.rows.clear();
+        grid.spare = [];
+        const first = createRow();
+        grid.rowHeight = 0;
+        fillRow(first, 0);
+        grid.rowHeight = first.offsetHeight || 1;
+        grid.rows.set(0, first);
+        refill = true;
+    }
+
+    const rowCount = Math.ceil(grid.items.length / grid.columns);
+    grid.container.style.height = `${rowCount * grid.rowHeight}px`;
+
+    const top = grid.container.getBoundingClientRect().top;
+    const first = Math.max(0, Math.floor(-top / grid.rowHeight) - OVERSCAN_ROWS);
+    const last = Math.min(rowCount - 1, Math.ceil((window.innerHeight - top) / grid.rowHeight) + OVERSCAN_ROWS);
+
+    grid.rows.forEach((row, index) => {
+        if (index < first || index > last) {
+            row.hidden = true;
+            grid.rows.delete(index);
+            grid.spare.push(row);
+        }
+    });
+    for (let index = first; index <= last; index++) {
+        let row = grid.rows.get(index);
+        if (row && !refill) continue;
+        if (!row) {
+            row = grid.spare.pop() || createRow();
+            grid.rows.set(index, row);
+        }
+        fillRow(row, index);
+    }
+}
+
+function scheduleGridUpdate() {
+    if (grid.frame || !grid.container || !grid.container.isConnected) return;
+    grid.frame = requestAnimationFrame(() => {
+        grid.frame = 0;
+        layoutGrid(false);
+    });
+}
+
+window.addEventListener('scroll', scheduleGridUpdate, { passive: true });
+window.addEventListener('resize', () => { grid.rowHeight = 0; scheduleGridUpdate(); });
+
+// One listener for all cards (the nodes are reused, so handlers can't be bound to a device)
+function onGridClick(e) {
+    const slot = e.target.closest('[data-index]');
+    if (!slot) return;
+    const d = grid.items[slot.dataset.index];
+    const action = e.target.closest('[data-action]');
+    if (!action) openDeviceDetails(d.id);
+    else if (action.dataset.action === 'select') toggleSelect(d.id, action.checked);
+    else if (action.dataset.action === 'print') printLabel(d.tracking_id, d.customer_name, d.model, d.created_by);
+    else if (action.dataset.action === 'status') openStatusModal(e, d.id, d.status);
+}
+
+function renderDevices(devices) {
+    const container = document.getElementById('mainContent');
+    if (devices.length === 0) {
+        grid.container = null;
+        container.innerHTML = '<div class="alert alert-info text-center">Δεν βρέθηκαν εγγραφές.</div>';
+        return;
+    }
+
+    if (!grid.container || !grid.container.isConnected) {
+        container.innerHTML = '<div class="device-grid position-relative"></div>';
+        grid.container = container.firstElementChild;
+        grid.container.addEventListener('click', onGridClick);
+        grid.rowHeight = 0;
+    }
+    grid.items = devices;
+    layoutGrid(true);
+}
+
+// Lowercased search text per device object (replaced objects get a new one)
+const searchKeys = new WeakMap();
+
+function searchKey(d) {
+    let key = searchKeys.get(d);
+    if (key === undefined) {
+        key = `${d.customer_name}\n${d.tracking_id}`.toLowerCase() + `\n${d.phone}`;
+        searchKeys.set(d, key);
+    }
+    return key;
+}
+
+function filterList() {
+    const term = document.getElementById('searchInput').value.toLowerCase();
+    renderDevices(term ? cachedData.filter(d => searchKey(d).includes(term)) : cachedData);
+}
+
+// Filter once typing pauses, not on every keystroke
+let searchTimer = 0;
+
+function onSearchInput() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(filterList, 150);
+}
+
+async function openDeviceDetails(id) {
+    if (detailsModalBs) detailsModalBs.show();
+    const container = document.getElementById('detailsContent');
+    container.innerHTML = '<div class="text-center py-5"><div class="spinner-border text-primary"></div></div>';
+
+    try {
+        const res = await fetch(`/api/devices/${id}/details`);
+        const data = await res.json();
+
+        let timelineHtml = '<ul class="list-group list-group-flush">';
+        let lastStatus = null;
+
+        data.logs.forEach(log => {
+            // If status is same as previous (which is "next" in this reversed chronological list), 
+            // we might want to hide the status badge and just show the note?
+            // Actually, let's just make the status text muted or smaller if it's a repeat.
+
+            let statusDisplay = `<strong>${log.status}</strong>`;
+            if (log.status === lastStatus) {
+                statusDisplay = `<span class="text-muted small"><i class="fas fa-caret-up me-1"></i> (Ίδια κατάσταση)</span>`;
+            }
+            lastStatus = log.status; // Update tracking
+
+            timelineHtml += `
+            <li class="list-group-item bg-transparent">
+                <div class="d-flex justify-content-between">
+                    <div>${statusDisplay}</div>
+                    <small class="text-muted">${log.timestamp}</small>
+                </div>
+                ${log.public_note ? `<div class="small text-muted"><i class="fas fa-comment me-1"></i>${log.public_note}</div>` : ''}
+                ${log.private_note ? `<div class="small text-danger bg-danger-subtle p-1 rounded mt-1"><i class="fas fa-user-secret me-1"></i>${log.private_note}</div>` : ''}
+                <div class="text-end small text-muted fst-italic">- ${log.user}</div>
+            </li>`;
+        });
+        timelineHtml += '</ul>';
+
+        container.innerHTML = `
+            <div class="row">
+                <div class="col-md-6 border-end">
+                    <h6 class="text-uppercase text-secondary fw-bold small mb-3">Πληροφορίες Πελάτη</h6>
+                    <div class="mb-3">
+                        <label class="small text-muted">Ονοματεπώνυμο</label>
+                        <div class="fw-bold fs-5">${data.customer.name}</div>
+                    </div>
+                    <div class="mb-3">
+                        <label class="small text-muted">Τηλέφωνο</label>
+                        <div><a href="tel:${data.customer.phone}" class="text-decoration-none fw-bold"><i class="fas fa-phone me-2"></i>${data.customer.phone}</a></div>
+                    </div>
+                    ${data.customer.email ? `<div class="mb-3"><label class="small text-muted">Email</label><div>${data.customer.email}</div></div>` : ''}
+                    
+                    <h6 class="text-uppercase text-secondary fw-bold small mt-4 mb-3">Πληροφορίες Συσκευής</h6>
+                    <div class="mb-2"><strong>ID:</strong> <span class="font-monospace bg-light px-2 rounded">${data.tracking_id}</span></div>
+                    <div class="mb-2"><strong>Μάρκα:</strong> ${data.brand || '-'}</div>
+                    <div class="mb-2"><strong>Μοντέλο:</strong> ${data.model}</div>
+                    <div class="mb-2 bg-light p-2 rounded"><em>${data.description || '-'}</em></div>
+                    
+                    <div class="mt-4">
+                        <label class="form-label fw-bold small text-danger">Τεχνικές Σημειώσεις (Εσωτερικό)</label>
+                        <textarea id="techNotesInput" class="form-control" rows="4">${data.technician_notes || ''}</textarea>
+                        <button onclick="saveTechNotes(${data.id})" class="btn btn-sm btn-danger mt-2 w-100">Αποθήκευση Σημειώσεων</button>
+                    </div>
+                </div>
+                <div class="col-md-6">
+                    <h6 class="text-uppercase text-secondary fw-bold small mb-3">Ιστορικό Εργασιών</h6>
+                    <div class="overflow-auto border rounded bg-white" style="max-height: 400px;">
+                        ${timelineHtml}
+                    </div>
+                </div>
+            </div>
+        `;
+    } catch (e) {
+        console.error(e);
+        container.innerHTML = '<div class="alert alert-danger">Σφάλμα φόρτωσης λεπτομερειών</div>';
+    }
+}
+
+async function saveTechNotes(id) {
+    const notes = document.getElementById('techNotesInput').value;
+    try {
+        const res = await fetch(`/api/devices/${id}/update_notes`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ technician_notes: notes })
+        });
+        if (res.ok) showAlert('Επιτυχία', 'Οι σημειώσεις αποθηκεύτηκαν.', 'success');
+        else showAlert('Σφάλμα', 'Απέτυχε η αποθήκευση.', 'error');
+    } catch (e) { showAlert('Σφάλμα', 'Δικτυακό πρόβλημα.', 'error'); }
+}
+
+function openStatusModal(e, id, status) {
+    e.stopPropagation(); // Prevent opening details modal
+    document.getElementById('statusDeviceId').value = id;
+    document.getElementById('newStatus').value = status;
+    document.getElementById('statusPublicNote').value = '';
+    document.getElementById('statusPrivateNote').value = '';
+
+    if (!statusModalBs) {
+        const el = document.getElementById('statusModal');
+        if (el) statusModalBs = new bootstrap.Modal(el);
+    }
+    if (statusModalBs) statusModalBs.show();
+}
+
+function printLabel(id, name, model, creator) {
+    try {
+        document.getElementById('qrImage').src = `/generate_qr/${id}`;
+        document.getElementById('printId').textContent = id;
+        document.getElementById('printCustomer').textContent = name;
+        document.getElementById('printModel').textContent = model;
+        document.getElementById('printDate').textContent = new Date().toLocaleDateString('el-GR');
+        document.getElementById('printStaffName').textContent = creator || '-';
+        document.getElementById('printModal').classList.remove('d-none');
+    } catch (e) { console.error(e); }
+}
+
+// --- MISSING HANDLERS ---
+async function handleAddDevice(e) {
+    e.preventDefault();
+    const btn = e.target.querySelector('button[type="submit"]');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Καταχώρηση...';
+    btn.disabled = true;
+
+    const fd = new FormData(e.target);
+
+    try {
+        const res = await fetch('/add_device', { method: 'POST', body: fd });
+        const data = await res.json();
+
+        if (res.ok) {
+            if (addDeviceModalBs) addDeviceModalBs.hide();
+            e.target.reset();
+            showAlert('Επιτυχία', `Η συσκευή καταχωρήθηκε με ID: ${data.id}`, 'success');
+            // Refresh list (the live stream patches it when connected)
+            if (!liveConnected) {
+                loadStats();
+                if (currentView === 'active') loadDevices();
+            }
+
+            // Print Label Prompt
+            // printLabel(data.id, fd.get('customer_name'), fd.get('model'), data.created_by);
+        } else {
+            showAlert('Σφάλμα', data.error || 'Απέτυχε η καταχώρηση', 'error');
+        }
+    } catch (err) {
+        console.error(err);
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα', 'error');
+    } finally {
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
+
+async function handleUpdateStatus(e) {
+    e.preventDefault();
+    const id = document.getElementById('statusDeviceId').value;
+    const newStatus = document.getElementById('newStatus').value;
+    const publicNote = document.getElementById('statusPublicNote').value;
+    const privateNote = document.getElementById('statusPrivateNote').value;
+
+    const btn = e.target.querySelector('button[type="submit"]');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Αποθήκευση...';
+    btn.disabled = true;
+
+    const fd = new FormData();
+    fd.append('status', newStatus);
+    fd.append('public_note', publicNote);
+    fd.append('private_note', privateNote);
+
+    try {
+        const res = await fetch(`/update_status/${id}`, { method: 'POST', body: fd });
+        const data = await res.json();
+
+        if (res.ok) {
+            if (statusModalBs) statusModalBs.hide();
+            showAlert('Ενημερώθηκε', 'Η κατάσταση άλλαξε επιτυχώς.', 'success');
+            if (!liveConnected) {
+                loadStats();
+                loadDevices();
+            }
+
+            // Log notification result if any
+            if (newStatus === 'Έτοιμο') {
+                // The backend handles sending, we just show success. 
+            }
+        } else {
+            showAlert('Σφάλμα', data.error || 'Απέτυχε η ενημέρωση', 'error');
+        }
+    } catch (err) {
+        console.error(err);
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα', 'error');
+    } finally {
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
+
+// --- BULK STATUS ---
+function toggleSelect(id, checked) {
+    if (checked) selectedIds.add(id);
+    else selectedIds.delete(id);
+    updateBulkBar();
+}
+
+function clearSelection() {
+    selectedIds.clear();
+    document.querySelectorAll('#mainContent input[type="checkbox"]').forEach(el => el.checked = false);
+    updateBulkBar();
+}
+
+function updateBulkBar() {
+    document.getElementById('bulkCount').innerText = selectedIds.size;
+    document.getElementById('bulkBar').classList.toggle('d-none', selectedIds.size === 0);
+}
+
+async function applyBulkStatus() {
+    const btn = document.getElementById('btnBulkApply');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span>';
+    btn.disabled = true;
+
+    try {
+        const res = await fetch('/api/devices/bulk_status', {
+            method: 'POST', headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                device_ids: [...selectedIds],
+                status: document.getElementById('bulkStatus').value,
+                public_note: document.getElementById('bulkPublicNote').value
+            })
+        });
+        const data = await res.json();
+
+        if (res.ok) {
+            showAlert('Ενημερώθηκε', `${data.updated} συσκευές ενημερώθηκαν.`, 'success');
+            document.getElementById('bulkPublicNote').value = '';
+            clearSelection();
+            if (!liveConnected) {
+                loadStats();
+                loadDevices();
+            }
+        } else {
+            showAlert('Σφάλμα', data.error || 'Απέτυχε η ενημέρωση', 'error');
+        }
+    } catch (err) {
+        console.error(err);
+        showAlert('Σφάλμα', 'Δικτυακό πρόβλημα', 'error');
+    } finally {
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Configure the app before it is imported: scratch DB, metrics, user epochs and log file
+TMP = tempfile.mkdtemp(prefix='product_track_tests_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP, 'test.db')}"
+os.environ['METRICS_DIR'] = os.path.join(TMP, 'metrics')
+os.environ['USER_CACHE_DIR'] = os.path.join(TMP, 'user_epochs')
+os.environ['LOG_FILE'] = os.path.join(TMP, 'app.log')
+os.environ.pop('QUERY_BUDGET_MODE', None)  # Unset + TESTING = 'raise'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app, init_db
+    from models import db, User
+
+    app.config['TESTING'] = True
+    init_db()
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').first()
+        admin.is_first_login = False
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 302
+    return client
@@ -0,0 +1,36 @@
+from query_budget import QueryBudgetExceeded
+
+
+def test_budgeted_routes_stay_within_budget(app, client):
+    """Hits every @query_budget route once; with TESTING on, going over a budget (or an N+1) raises."""
+    urls = app.url_map.bind('localhost')
+    hit = set()
+
+    def call(method, path, **kwargs):
+        try:
+            response = client.open(path, method=method, **kwargs)
+        except QueryBudgetExceeded as e:
+            raise AssertionError(str(e)) from None
+        assert response.status_code < 400, (method, path, response.status_code)
+        hit.add(urls.match(path, method=method)[0])
+        return response
+
+    created = call('POST', '/add_device', data={
+        'customer_name': 'Πελάτης Δοκιμής', 'phone': '6900000001', 'brand': 'Apple', 'model': 'iPhone 13',
+    })
+    tracking_id = created.get_json()['id']
+    listed = call('GET', '/api/devices')
+    device_id = next(d['id'] for d in listed.get_json() if d['tracking_id'] == tracking_id)
+
+    call('POST', f'/update_status/{device_id}', data={'status': 'Υπό Έλεγχο', 'public_note': 'Έλεγχος'})
+    call('POST', f'/api/devices/{device_id}/update_notes', json={'technician_notes': 'Οθόνη'})
+    call('POST', '/api/devices/bulk_status', json={'status': 'Υπό Επισκευή', 'device_ids': [device_id]})
+    call('GET', '/api/devices/changes', query_string={'since': listed.headers['X-Sync-Cursor']})
+    call('GET', '/api/stats')
+    call('GET', f'/api/devices/{device_id}/details')
+    call('GET', f'/api/devices/{device_id}/notifications')
+    call('GET', '/track', query_string={'id': tracking_id})
+    call('GET', '/', query_string={'id': tracking_id})
+
+    budgeted = {endpoint for endpoint, view in app.view_functions.items() if hasattr(view, 'query_budget')}
+    assert budgeted - hit == set(), 'budgeted routes missing from this test'
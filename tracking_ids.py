@@ -0,0 +1,102 @@
+import re
+from sqlalchemy import update, select
+from models import db, TrackingSequence
+
+# Tracking IDs: "SER" + 6 obfuscated base-36 chars + 1 check char (e.g. SER7A2B9QK).
+# The 6 chars are a bijective scramble of a DB sequence value, so two different
+# sequence values can never produce the same ID -> no uniqueness pre-check needed.
+PREFIX = "SER"
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+PAYLOAD_LEN = 6
+SPACE = len(ALPHABET) ** PAYLOAD_LEN
+
+# Affine round constants. Multipliers must be coprime with 36 (odd, not divisible by 3)
+# so each round is a permutation of [0, SPACE).
+_ROUNDS = (
+    (1580030173, 912673),
+    (2012581957, 1335013),
+)
+
+SEQUENCE_NAME = 'device'
+
+_NEW_FORMAT = re.compile(r'^SER[0-9A-Z]{7}$')
+_LEGACY_FORMAT = re.compile(r'^SER[0-9A-Z]{6}$')  # Random IDs issued before the allocator
+
+
+def _encode(value):
+    chars = []
+    for _ in range(PAYLOAD_LEN):
+        value, rem = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[rem])
+    return ''.join(reversed(chars))
+
+
+def _scramble(value):
+    """Bijective mapping of a sequence value onto the 6-char ID space."""
+    for mul, add in _ROUNDS:
+        value = (value * mul + add) % SPACE
+        # Reverse the base-36 digits between rounds so low bits spread to the front
+        value = int(_encode(value)[::-1], len(ALPHABET))
+    return value
+
+
+def check_char(payload):
+    """Luhn mod 36 check character. Catches every single-char typo and
+    most adjacent swaps (e.g. SER7A2B9 vs SER7A29B)."""
+    n = len(ALPHABET)
+    total = 0
+    factor = 2
+    for ch in reversed(payload):
+        addend = factor * ALPHABET.index(ch)
+        total += addend // n + addend % n
+        factor = 1 if factor == 2 else 2
+    return ALPHABET[(n - total % n) % n]
+
+
+def format_tracking_id(value):
+    payload = _encode(_scramble(value))
+    return f"{PREFIX}{payload}{check_char(payload)}"
+
+
+def normalize_tracking_id(raw):
+    return (raw or '').strip().upper()
+
+
+def is_valid_tracking_id(tracking_id):
+    """Offline format check used by /track to reject typos without a DB hit."""
+    if _LEGACY_FORMAT.match(tracking_id):
+        return True
+    if not _NEW_FORMAT.match(tracking_id):
+        return False
+    payload = tracking_id[len(PREFIX):-1]
+    return check_char(payload) == tracking_id[-1]
+
+
+def allocate_tracking_ids(count=1):
+    """
+    Reserves `count` consecutive sequence values and returns their tracking IDs.
+    Runs inside the caller's transaction: the UPDATE takes the row/write lock, so
+    concurrent intakes get disjoint blocks, and a rollback simply returns the block.
+    """
+    if count < 1:
+        return []
+
+    result = db.session.execute(
+        update(TrackingSequence)
+        .where(TrackingSequence.name == SEQUENCE_NAME)
+        .values(next_value=TrackingSequence.next_value + count)
+    )
+    if result.rowcount == 0:
+        # Sequence row missing (e.g. DB created before the allocator existed)
+        db.session.add(TrackingSequence(name=SEQUENCE_NAME, next_value=1 + count))
+        db.session.flush()
+        end = 1 + count
+    else:
+        end = db.session.execute(
+            select(TrackingSequence.next_value).where(TrackingSequence.name == SEQUENCE_NAME)
+        ).scalar_one()
+
+    start = end - count
+    if end > SPACE:
+        raise RuntimeError("Tracking ID space exhausted")
+    return [format_tracking_id(value) for value in range(start, end)]
@@ -0,0 +1,116 @@
+import os
+import time
+import threading
+import logging
+from flask_login import UserMixin
+from sqlalchemy import event
+from models import db, User
+
+# Columns a cached identity is built from; changing any of them bumps the user's epoch
+CACHED_FIELDS = ('username', 'role', 'is_first_login', 'password_hash')
+
+
+class CachedUser(UserMixin):
+    """Detached snapshot of a User for current_user (no password hash, no lazy loads).
+    Code that writes to the user loads the ORM row: db.session.get(User, current_user.id)."""
+
+    def __init__(self, user):
+        self.id = user.id
+        self.username = user.username
+        self.role = user.role
+        self.is_first_login = bool(user.is_first_login)
+
+
+class UserCache:
+    """
+    Per-process cache of authenticated identities for Flask-Login's user_loader.
+
+    Each user has an epoch file (USER_CACHE_DIR/<id>) that is replaced after every
+    commit touching that user. An entry is valid while the file's (inode, mtime) still
+    matches what was seen when it was loaded, so a password/role change or deletion
+    in one worker invalidates every worker's copy on their next request. A hit costs
+    one stat() and no query; USER_CACHE_TTL bounds staleness for edits made outside
+    the app (manual SQL).
+    """
+
+    def __init__(self):
+        self._dir = None
+        self._ttl = 300
+        self._lock = threading.Lock()
+        self._entries = {}  # user_id -> (epoch, loaded_at, CachedUser or None)
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_DIR', os.path.join(app.instance_path, 'user_epochs'))
+        app.config.setdefault('USER_CACHE_TTL', 300)
+        self._dir = app.config['USER_CACHE_DIR']
+        self._ttl = app.config['USER_CACHE_TTL']
+        os.makedirs(self._dir, exist_ok=True)
+        if not event.contains(db.session, 'after_flush', _collect_changes):
+            event.listen(db.session, 'after_flush', _collect_changes)
+            event.listen(db.session, 'after_commit', _bump_changed)
+            event.listen(db.session, 'after_rollback', _discard_changes)
+
+    def _path(self, user_id):
+        return os.path.join(self._dir, str(int(user_id)))
+
+    def _epoch(self, user_id):
+        try:
+            st = os.stat(self._path(user_id))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns)
+
+    def get(self, user_id):
+        user_id = int(user_id)
+        epoch = self._epoch(user_id)  # Read before the row so a concurrent bump is never missed
+        entry = self._entries.get(user_id)
+        if entry and entry[0] == epoch and time.monotonic() - entry[1] < self._ttl:
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        user = db.session.get(User, user_id)
+        cached = CachedUser(user) if user else None
+        with self._lock:
+            self._entries[user_id] = (epoch, time.monotonic(), cached)
+        return cached
+
+    def bump(self, user_id):
+        """Invalidates user_id in every worker (new file -> new inode and mtime)."""
+        path = self._path(user_id)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp, 'w') as f:
+                f.write(str(time.time_ns()))
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.error(f"User cache bump failed for {user_id}: {e}")
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+
+user_cache = UserCache()
+
+
+def _collect_changes(session, flush_context):
+    changed = session.info.setdefault('user_cache_changed', set())
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = db.inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in CACHED_FIELDS):
+                changed.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+def _bump_changed(session):
+    # After commit, so a worker reloading on the new epoch reads the committed row
+    for user_id in session.info.pop('user_cache_changed', ()):
+        user_cache.bump(user_id)
+
+
+def _discard_changes(session):
+    session.info.pop('user_cache_changed', None)